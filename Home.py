@@ -1,4 +1,7 @@
 import streamlit as st
+from utils.warmup import start_warmup # load the scoring model in the background while the visitor reads this page
+
+start_warmup()
 
 
 st.header("SkillGap Radar 🎯")
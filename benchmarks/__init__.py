@@ -0,0 +1 @@
+# offline benchmarks of the app stages, run with: python -m benchmarks.run
@@ -0,0 +1,67 @@
+import json # the skill taxonomy is a JSON file
+import random # synthetic documents, seeded so every run gets the same corpus
+from utils.pdf_render import _render as render_pdf # resumes are benchmarked as real PDFs (uncached render)
+from utils.skills import SKILL_TAXONOMY # skills to sprinkle into resumes and JDs
+
+# pages of text per size, a page is roughly 450 words
+SIZES = {"short": 1, "medium": 3, "long": 8}
+
+FILLER = (
+    "designed built maintained improved led delivered automated migrated reduced increased team customers "
+    "platform service pipeline dashboard reports latency costs quality releases features users data systems "
+    "across within using together with for the and of to in on by"
+).split()
+SECTIONS = ["Summary", "Experience", "Projects", "Education", "Certifications", "Skills"]
+
+
+def _skills():
+    with open(SKILL_TAXONOMY, encoding="utf-8") as f:
+        return sorted(json.load(f))
+
+
+def _sentence(rng, skills):
+    words = rng.choices(FILLER, k=rng.randint(10, 22))
+    words.insert(rng.randrange(len(words)), rng.choice(skills))
+    return " ".join(words).capitalize() + "."
+
+
+def make_resume(rng, pages, skills):
+    lines = [f"Candidate {rng.randint(1000, 9999)}", "candidate@example.com | +1 555 0100", ""]
+    words = 0
+    while words < pages * 450:
+        section = rng.choice(SECTIONS)
+        lines += [section, ""]
+        for _ in range(rng.randint(3, 8)):
+            line = "- " + _sentence(rng, skills)
+            words += len(line.split())
+            lines.append(line)
+        lines.append("")
+    lines += ["Skills", ", ".join(rng.sample(skills, 12))]
+    return "\n".join(lines)
+
+
+def make_job_description(rng, paragraphs, skills):
+    required = rng.sample(skills, 8)
+    text = [f"We are hiring a {rng.choice(['Backend', 'Data', 'ML', 'Frontend', 'DevOps'])} Engineer."]
+    for _ in range(paragraphs):
+        text.append(" ".join(_sentence(rng, required) for _ in range(rng.randint(3, 6))))
+    text.append("Requirements: " + ", ".join(required) + ".")
+    return "\n\n".join(text)
+
+
+# Returns a list of {"name", "size", "resume", "pdf", "job_desc"}: count documents of every size
+def build_corpus(count=5, seed=42):
+    rng = random.Random(seed)
+    skills = _skills()
+    corpus = []
+    for size, pages in SIZES.items():
+        for i in range(count):
+            resume = make_resume(rng, pages, skills)
+            corpus.append({
+                "name": f"{size}-{i}",
+                "size": size,
+                "resume": resume,
+                "pdf": render_pdf(resume),
+                "job_desc": make_job_description(rng, pages * 2, skills),
+            })
+    return corpus
@@ -0,0 +1,148 @@
+import time # simulated network latency
+from types import SimpleNamespace # light stand-ins for the SDK response objects
+from unittest import mock # swap the real clients for the fakes
+
+# A report in the format the analyzer prompt asks for, so ReportParser has real work to do
+FAKE_REPORT = "\n".join(
+    [f"{score}/5 {mark} Point {i}: the resume {'matches' if score > 2 else 'does not show'} this requirement. " * 3
+     for i, (score, mark) in enumerate([(4, "✅"), (2, "❌"), (3, "⚠️"), (5, "✅"), (1, "❌")] * 4)]
+    + ["", "**Missing Skills List:**", "- Kubernetes", "- Terraform", "- GraphQL", "",
+       "Suggestions to improve your resume:", "Add measurable results to every project. " * 10]
+)
+
+
+# Groq chat API: the first piece arrives after first_token seconds, the rest every chunk_delay seconds
+class FakeGroq:
+    def __init__(self, first_token=0.3, chunk_delay=0.005, chunk_chars=20, text=FAKE_REPORT):
+        self.first_token = first_token
+        self.chunk_delay = chunk_delay
+        self.chunk_chars = chunk_chars
+        self.text = text
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, messages, model, stream=False, **kwargs):
+        self.calls += 1
+        time.sleep(self.first_token)
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))])
+        return _FakeStream(self)
+
+
+class _FakeStream:
+    def __init__(self, fake):
+        self.fake = fake
+
+    def __iter__(self):
+        text, size = self.fake.text, self.fake.chunk_chars
+        for start in range(0, len(text), size):
+            if start:
+                time.sleep(self.fake.chunk_delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[start:start + size]))])
+
+    def close(self):
+        pass
+
+
+class _Request:
+    def __init__(self, latency, result):
+        self.latency = latency
+        self.result = result
+
+    def execute(self, http=None, **kwargs):
+        time.sleep(self.latency)
+        return self.result
+
+
+# YouTube Data API: search().list(...).execute() returns max_results videos after latency seconds
+class FakeYouTube:
+    def __init__(self, latency=0.15):
+        self.latency = latency
+        self.calls = 0
+
+    def search(self):
+        return self
+
+    def list(self, q, maxResults=5, **kwargs):
+        self.calls += 1
+        items = [
+            {
+                "id": {"videoId": f"video{i}"},
+                "snippet": {
+                    "title": f"{q} part {i}",
+                    "description": f"Learn {q} from scratch.",
+                    "thumbnails": {"medium": {"url": "https://i.ytimg.com/vi/video/mqdefault.jpg"}},
+                },
+            }
+            for i in range(maxResults)
+        ]
+        return _Request(self.latency, {"items": items})
+
+
+# Google Docs + Drive APIs: documents().create / batchUpdate, files().create / get / list / update / delete and about().get
+class FakeGoogle:
+    def __init__(self, latency=0.2):
+        self.latency = latency
+        self.calls = 0
+        self._next_id = 0
+
+    def _request(self, result):
+        self.calls += 1
+        return _Request(self.latency, result)
+
+    def _new_id(self):
+        self._next_id += 1
+        return f"doc{self._next_id}"
+
+    def documents(self):
+        return SimpleNamespace(
+            create=lambda body=None, **kwargs: self._request({"documentId": self._new_id()}),
+            batchUpdate=lambda documentId, body=None, **kwargs: self._request({"documentId": documentId}),
+        )
+
+    def about(self):
+        return SimpleNamespace(get=lambda **kwargs: self._request({"user": {"permissionId": "fake-user"}}))
+
+    def files(self):
+        return SimpleNamespace(
+            create=lambda body=None, **kwargs: self._request({"id": self._new_id()}),
+            get=lambda fileId, **kwargs: self._request({"id": fileId, "trashed": False}),
+            list=lambda **kwargs: self._request({"files": []}),
+            update=lambda fileId, **kwargs: self._request({"id": fileId}),
+            delete=lambda fileId, **kwargs: self._request({}),
+        )
+
+
+# Swap every external API of the app for the fakes; returns the started patches (stop them when done)
+def install_fakes(fake_groq, fake_youtube, fake_google):
+    import utils.llm as llm
+
+    patches = [
+        mock.patch.object(llm, "_client", fake_groq),
+        # the fake account has no rate limit, the benchmark measures the app and not the limiter
+        mock.patch.object(llm, "_request_bucket", llm.TokenBucket(10 ** 9)),
+        mock.patch.object(llm, "_token_bucket", llm.TokenBucket(10 ** 9)),
+        mock.patch.dict("os.environ", {"GROQ_API_KEY": "fake", "YOUTUBE_API_KEY": "fake"}),
+    ]
+    try:
+        import utils.youtube as youtube
+        patches += [
+            mock.patch.object(youtube, "get_client", lambda: fake_youtube),
+            mock.patch.object(youtube, "_thread_http", lambda: None),
+        ]
+    except ImportError:  # google-api-python-client not installed, the YouTube stages are skipped
+        pass
+    try:
+        import googleapiclient.discovery
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        credentials = SimpleNamespace(valid=True, expired=False, refresh_token=None, to_json=lambda: "{}")
+        flow = SimpleNamespace(run_local_server=lambda **kwargs: credentials)
+        patches += [
+            mock.patch.object(googleapiclient.discovery, "build", lambda *args, **kwargs: fake_google),
+            mock.patch.object(InstalledAppFlow, "from_client_secrets_file", lambda *args, **kwargs: flow),
+        ]
+    except ImportError:  # Google client libraries not installed, the Docs page is skipped
+        pass
+    for patch in patches:
+        patch.start()
+    return patches
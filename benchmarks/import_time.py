@@ -0,0 +1,60 @@
+import os # page paths
+import re # read the -X importtime output
+import ast # find the import statements of a page
+import sys # the interpreter to measure with
+import json # results
+import argparse # command line options
+import subprocess # every measurement runs in a fresh interpreter, like a new Streamlit worker
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Home.py"] + sorted(os.path.join("pages", name) for name in os.listdir(os.path.join(ROOT, "pages")) if name.endswith(".py"))
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+# only the top level import statements of a page script, i.e. what runs before anything is shown
+def page_imports(path):
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+# Seconds to run the imports of a page in a new interpreter, plus the slowest top level modules
+def measure_page(path, top=8):
+    code = page_imports(path)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    modules = []
+    total = 0
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if indent == 1:  # imported by the page itself, not by another module
+            modules.append((name, cumulative / 1e6))
+            total += cumulative
+    error = None
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1]
+    modules.sort(key=lambda item: -item[1])
+    return {"seconds": total / 1e6, "slowest": dict(modules[:top]), "error": error}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long the imports of every page take in a new process")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    for path in PAGES:
+        results[path] = measure_page(path)
+        slowest = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in list(results[path]["slowest"].items())[:3])
+        print(f"{path:45s} {results[path]['seconds']:6.2f}s  {slowest}" + (f"  ({results[path]['error']})" if results[path]["error"] else ""))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
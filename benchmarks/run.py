@@ -0,0 +1,214 @@
+import os # cache folder and paths
+import sys # platform details and exit code
+import json # results are written as JSON
+import time # timings
+import tempfile # every run starts with empty caches
+import platform # machine details stored with the results
+import argparse # command line options
+import subprocess # commit the results belong to
+import numpy as np # latency percentiles
+
+# set before the app modules read it, so no result comes from a cache filled by an earlier run
+os.environ["SKILLGAP_CACHE_DIR"] = tempfile.mkdtemp(prefix="skillgap-bench-")
+os.environ.setdefault("REPORT_CACHE_DISK", "0")
+
+from benchmarks.corpus import build_corpus # synthetic resumes (PDF) and job descriptions
+from benchmarks.fakes import FakeGroq, FakeYouTube, FakeGoogle, FAKE_REPORT, install_fakes # offline APIs
+from utils.pdf_text import PDF_ENGINE, extract_text_from_pdf # stage: PDF -> text
+from utils.analysis import calculate_similarity_bert # stage: ATS score (full or chunked, as ATS_SCORING_MODE says)
+from utils.embeddings import ATS_MODEL_NAME, encode_texts # model load
+from utils.report import stream_report # stage: AI report
+from utils.report_parser import ReportParser # stage: report parsing
+from utils.pdf_render import _render as render_pdf # stage: FPDF export (uncached)
+from utils.artifacts import artifact_store # the pages read the resume through a session handle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+PAGES = {
+    "page_resume_analyzer": os.path.join(ROOT, "pages", "1_Resume Analyzer.py"),
+    "page_course_recommendations": os.path.join(ROOT, "pages", "2_View Course Recommendations.py"),
+    "page_edit_with_ai": os.path.join(ROOT, "pages", "3_Edit Resume with AI.py"),
+    "page_edit_with_docs": os.path.join(ROOT, "pages", "4_Edit Resume with Docs.py"),
+}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+# Run fn once per input and summarize the latencies
+def measure(fn, inputs):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    for item in inputs:
+        began = time.perf_counter()
+        try:
+            fn(item)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            continue
+        latencies.append(time.perf_counter() - began)
+    total = time.perf_counter() - start
+    result = {"n": len(latencies), "errors": len(errors), "peak_rss_mb": peak_rss_mb()}
+    if errors:
+        result["first_error"] = errors[0]
+    if latencies:
+        ms = np.array(latencies) * 1000
+        result.update({
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p95_ms": float(np.percentile(ms, 95)),
+            "p99_ms": float(np.percentile(ms, 99)),
+            "mean_ms": float(ms.mean()),
+            "throughput_per_s": len(latencies) / total,
+        })
+    return result
+
+
+def _report(doc):
+    parser = ReportParser()
+    for chunk in stream_report(doc["resume"], doc["job_desc"]):
+        parser.feed(chunk)
+    parser.finish()
+
+
+def _parse_report(chunk_chars):
+    parser = ReportParser()
+    for start in range(0, len(FAKE_REPORT), chunk_chars):
+        parser.feed(FAKE_REPORT[start:start + chunk_chars])
+    parser.finish()
+
+
+def _run_page(path, state, click=None):
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(path, default_timeout=300)
+    for key, value in state.items():
+        app.session_state[key] = value
+    app.run()
+    if click is not None:
+        next(button for button in app.button if button.label.startswith(click)).click().run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+
+
+def run_benchmarks(count, seed, groq_latency, api_latency, pages=True):
+    fake_groq, fake_youtube, fake_google = FakeGroq(first_token=groq_latency), FakeYouTube(api_latency), FakeGoogle(api_latency)
+    patches = install_fakes(fake_groq, fake_youtube, fake_google)
+    try:
+        corpus = build_corpus(count, seed)
+        stages = {}
+        stages["model_load"] = measure(lambda _: encode_texts(["warm up"]), [None])
+        stages["extract_pdf_text"] = measure(lambda doc: extract_text_from_pdf(doc["pdf"]), corpus)
+        stages["calculate_similarity_bert"] = measure(lambda doc: calculate_similarity_bert(doc["resume"], doc["job_desc"]), corpus)
+        stages["report_parsing"] = measure(_parse_report, [20] * len(corpus))
+        stages["get_report"] = measure(_report, corpus)
+        stages["pdf_export"] = measure(lambda doc: render_pdf(doc["resume"]), corpus)
+        try:
+            from utils.youtube import search_courses_for_skills
+            skill_sets = [[f"{doc['name']} skill {i}" for i in range(5)] for doc in corpus]
+            stages["course_search"] = measure(search_courses_for_skills, skill_sets)
+        except ImportError as e:
+            stages["course_search"] = {"skipped": str(e)}
+
+        if pages:
+            # every page run uses a new resume, so nothing is answered from the caches of an earlier run
+            variants = [dict(doc, resume=f"{doc['resume']}\n\nVariant {page}") for page in PAGES for doc in corpus]
+            docs = iter(variants)
+            for name, path in PAGES.items():
+                if name == "page_edit_with_docs" and "google_auth_oauthlib" not in sys.modules:
+                    stages[name] = {"skipped": "Google client libraries not installed"}
+                    continue
+                if name == "page_course_recommendations" and not os.getenv("YOUTUBE_API_KEY"):  # the page stops without it
+                    stages[name] = {"skipped": "YOUTUBE_API_KEY not set"}
+                    continue
+                click = "✨" if name == "page_edit_with_ai" else None
+                stages[name] = measure(
+                    lambda doc: _run_page(path, {
+                        "form_submitted": True,
+                        "resume": artifact_store.put("benchmark", "resume", doc["resume"]),
+                        "job_desc": artifact_store.put("benchmark", "job_desc", doc["job_desc"]),
+                        "skills": [f"{doc['name']} page skill {i}" for i in range(5)],
+                    }, click),
+                    [next(docs) for _ in corpus],
+                )
+        return stages, {"groq_calls": fake_groq.calls, "youtube_calls": fake_youtube.calls, "google_calls": fake_google.calls}
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+# Print how every stage changed against an earlier result file, returns False when one got slower than threshold
+def compare(baseline, current, threshold):
+    ok = True
+    for name, stage in current["stages"].items():
+        before = baseline["stages"].get(name, {})
+        if "p50_ms" not in stage or "p50_ms" not in before:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            change = stage[metric] / before[metric] - 1
+            flag = "❌" if change > threshold else "✅"
+            ok = ok and change <= threshold
+            print(f"{flag} {name:30s} {metric}: {before[metric]:9.1f} -> {stage[metric]:9.1f} ms ({change:+.0%})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every stage of SkillGap Radar offline (fake Groq, YouTube and Google APIs)")
+    parser.add_argument("--count", type=int, default=5, help="documents of each size (short, medium, long)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--groq-latency", type=float, default=0.3, help="seconds before the fake Groq API answers")
+    parser.add_argument("--api-latency", type=float, default=0.15, help="seconds per fake YouTube / Google call")
+    parser.add_argument("--skip-pages", action="store_true", help="do not run the Streamlit pages with AppTest")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown that counts as a regression (0.1 = 10%%)")
+    args = parser.parse_args()
+
+    stages, calls = run_benchmarks(args.count, args.seed, args.groq_latency, args.api_latency, pages=not args.skip_pages)
+    commit = current_commit()
+    result = {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "count": args.count, "seed": args.seed, "groq_latency": args.groq_latency, "api_latency": args.api_latency,
+            "ats_model": ATS_MODEL_NAME, "pdf_engine": PDF_ENGINE,
+        },
+        "api_calls": calls,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    for name, stage in stages.items():
+        if "p50_ms" in stage:
+            print(f"{name:30s} p50 {stage['p50_ms']:9.1f} ms  p95 {stage['p95_ms']:9.1f} ms  p99 {stage['p99_ms']:9.1f} ms  "
+                  f"{stage['throughput_per_s']:7.2f}/s  errors {stage['errors']}")
+        else:
+            print(f"{name:30s} {stage.get('skipped') or stage.get('first_error')}")
+    print(f"peak RSS {result['peak_rss_mb']} MB, results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            if not compare(json.load(f), result, args.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
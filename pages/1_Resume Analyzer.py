@@ -1,19 +1,15 @@
 import streamlit as st  # used for frontend buttons, input fields, layout, etc.
-from pdfminer.high_level import extract_text # extract text from pdf
-from sentence_transformers import SentenceTransformer # generate Embeddings of text like vector A, vector B
-from sklearn.metrics.pairwise import cosine_similarity # helps in calculating the score from the vector 
-from groq import Groq # API for genrating ai report
-import re # regular expression function extract pattens from the text 
-from dotenv import load_dotenv # extract API Key from .env file
-import os # used to intract with environment to extract API  
-import urllib.parse as ul # used to manuplate url
-import tempfile # create a temporary file for pdf
-import base64 # converts file into binary for downloading and putting html buttons 
-from fpdf import FPDF # genrate pdf
-
-
-load_dotenv() # load environment
-api_key = os.getenv("GROQ_API_KEY") # fetch API key
+from utils.analysis import extract_pdf_text as extract_text_from_pdf, calculate_similarity_bert # analysis steps shared with the API and CLI
+from utils.report import stream_report # Groq analysis report (cached, streamed)
+from utils.llm import LLMError # friendly message when the AI service is busy or failing
+import time # limit how often the streamed report is redrawn
+from utils.report_parser import ReportParser # reads scores and missing skills from the report while it streams
+from utils.workers import run_in_background # compute the ATS score while the AI report is generated
+from utils.job_index import get_job_index # library of job descriptions for reverse matching
+from utils.skills import find_missing_skills # local skill taxonomy matcher, no LLM needed
+from utils.telemetry import stage, record, profiled # per-stage timings, ?profile=1 profiles one analysis
+from utils.warmup import start_warmup, warmup_state # the model loads in the background while the form is filled
+from utils.artifacts import set_session_artifact, get_session_artifact # the resume text is kept once, the session only has a handle
 
 #This block makes sure that these variables exist in Streamlit memory before we use them, 
 #so we can avoid errors and keep user inputs saved across interactions.
@@ -30,104 +26,62 @@ st.title("AI Resume Analyzer 📝")
 # Function to extract text from PDF
 def extract_pdf_text(uploaded_file):
     try:
-        extracted_text = extract_text(uploaded_file)
+        extracted_text = extract_text_from_pdf(uploaded_file)
         return extracted_text
     except Exception as e:
         st.error(f"Error extracting text from PDF: {str(e)}")
         return "Could not extract text from the PDF file."
 
-# Function to calculate similarity 
-#Convert both texts into numerical vectors using BERT, These vectors represent the meaning of the texts in mathematical terms.
-def calculate_similarity_bert(text1, text2):
-    ats_model = SentenceTransformer('sentence-transformers/all-mpnet-base-v2')      
-    # Encode the texts directly to embeddings
-    embeddings1 = ats_model.encode([text1])
-    embeddings2 = ats_model.encode([text2])
-    
-    # Calculate cosine similarity without adding an extra list layer
-    #Resume text	→ SentenceTransformer	→ Embedding Vector A
-    #Job description	→ SentenceTransformer	→ Embedding Vector B
-    #A & B → cosine_similarity	→ Score (0.0–1.0)	e.g. 0.83
-    similarity = cosine_similarity(embeddings1, embeddings2)[0][0]
-    similarity = similarity*100
-    return similarity
-
-# sends resume and jd to the ai to genrate the report 
-def get_report(resume,job_desc):
-    client = Groq(api_key=api_key)
-
-    prompt=f"""
-    # Context:
-    - You are an AI Resume Analyzer, you will be given Candidate's resume and Job Description of the role he is applying for.
-
-    # Instruction:
-    - Analyze candidate's resume based on the possible points that can be extracted from job description,and give your evaluation on each point with the criteria below:  
-    - Consider all points like required skills, experience,etc that are needed for the job role.
-    - Calculate the score to be given (out of 5) for every point based on evaluation at the beginning of each point with a detailed explanation.  
-    - If the resume aligns with the job description point, mark it with ✅ and provide a detailed explanation.  
-    - If the resume doesn't align with the job description point, mark it with ❌ and provide a reason for it.  
-    - If a clear conclusion cannot be made, use a ⚠️ sign with a reason. 
-    - After the evaluation, **create a section named "Missing Skills List"**. 
-    - In "Missing Skills List", **list 3-5 key technical or domain skills** that are present in the job description but missing from the resume.
-    - The Final Heading should be "Suggestions to improve your resume:" and give where and what the candidate can improve to be selected for that job role.
-
-    # Inputs:
-    Candidate Resume: {resume}
-    ---
-    Job Description: {job_desc}
-
-    # Output:
-    - Each any every point should be given a score (example: 3/5 ). 
-    - Mention the scores and  relevant emoji at the beginning of each point and then explain the reason.
-    - A separate section at the end titled **Missing Skills List:** with bullet points or JSON list bullet points cam be emojies.
-    """
-
-    chat_completion = client.chat.completions.create(
-        messages=[{"role": "user", "content": prompt}],
-        model="llama-3.3-70b-versatile",
-    )
-    return chat_completion.choices[0].message.content
-
-# used to extract score from ai generated report to calculate average, calculate the average AI rating
-def extract_scores(text):
-    # Regular expression pattern to find scores in the format x/5, where x can be an integer or a float
-    pattern = r'(\d+(?:\.\d+)?)/5'
-    # Find all matches in the text
-    matches = re.findall(pattern, text)
-    # Convert matches to floats
-    scores = [float(match) for match in matches]
-    return scores
-
-def extract_missing_skills_from_ai_section(report: str):
-    match = re.search(r"Missing Skills List\s*:\s*(.+?)Suggestions to improve", report, re.DOTALL | re.IGNORECASE)
-    if match:
-        section = match.group(1).strip()
-        lines = [line.strip("–-•*🔸•➡️ ").strip() for line in section.strip().splitlines()]
-        skills = [line for line in lines if line and not line.lower().startswith("suggestions")]
-        return skills[:5]
-    return []
+# the report is shown inside a white box
+def render_report(place, report):
+    place.markdown(f"""
+            <div style='text-align: left; background-color: white; padding: 10px; border-radius: 10px; margin: 5px 0;'>
+                {report}
+            </div>
+            """, unsafe_allow_html=True)
 
 # <--------- Starting the Work Flow ---------> 
 
+# start loading the model now, it is usually ready by the time the form is submitted
+start_warmup()
+
+# shows whether the scoring model is loaded yet, refreshing itself only while it is loading
+# (not when it is ready, failed or the warm-up is turned off)
+warming = warmup_state()["status"] == "warming"
+
+@st.fragment(run_every=1 if warming else None)
+def model_status():
+    state = warmup_state()
+    if warming and state["status"] != "warming":
+        st.rerun()  # done loading: rerun the page once so this fragment stops refreshing
+    if state["status"] == "ready":
+        st.caption(f"✅ Scoring model ready (loaded in {state['seconds']:.1f}s)")
+    elif state["status"] == "failed":
+        st.caption(f"⚠️ Scoring model could not be preloaded, it will load on submit: {state['error']}")
+    elif state["status"] == "warming":
+        st.caption("⏳ Loading the scoring model in the background, you can fill in the form meanwhile...")
+
 # displays form only if the form is not submitted
 if not st.session_state.form_submitted:
+    model_status()
     with st.form("my_form"):
 
         # Taking input a Resume (PDF) file 
         resume_file = st.file_uploader(label="Upload your Resume/CV in PDF format", type="pdf")
 
         # Taking input Job Description
-        st.session_state.job_desc = st.text_area("Enter the Job Description of the role you are applying for:",placeholder="Job Description...")
+        job_desc = st.text_area("Enter the Job Description of the role you are applying for:",placeholder="Job Description...")
 
         # Form Submission Button
         submitted = st.form_submit_button("Analyze")
         if submitted:
 
             #  Allow only if Both Resume and Job Description are Submitted
-            if st.session_state.job_desc and resume_file:
+            if job_desc and resume_file:
                 st.info("Extracting Information")
 
-                st.session_state.resume = extract_pdf_text(resume_file) # calling the function to extract text from Resume
+                set_session_artifact("resume", extract_pdf_text(resume_file)) # calling the function to extract text from Resume
+                set_session_artifact("job_desc", job_desc)
 
                 st.session_state.form_submitted = True
                 st.rerun()                 # refresh the page to close the form and give results
@@ -138,40 +92,125 @@ if not st.session_state.form_submitted:
 
 
 if st.session_state.form_submitted:
+    resume = get_session_artifact("resume", "")
+    job_desc = get_session_artifact("job_desc", "")
+    if not resume or not job_desc:  # the session was unused for too long and its texts were dropped, ask for them again
+        st.session_state.form_submitted = False
+        st.rerun()
+
+    # open the page with ?profile=1 to save a profile of this one analysis
+    profile = profiled(st.query_params.get("profile") == "1", "analysis").start()
+    analysis_start = time.perf_counter()
     score_place = st.info("Generating Scores...")
 
-    # Call the function to get ATS Score
-    ats_score = calculate_similarity_bert(st.session_state.resume,st.session_state.job_desc)
+    # Call the function to get ATS Score on a background thread, it runs while the LLM report below is generated
+    ats_future = run_in_background(calculate_similarity_bert, resume, job_desc, True)
+    ats_result = None
 
     col1,col2 = st.columns(2,border=True)
     with col1:
         st.write("ATS Score:")
-        st.subheader(str(ats_score))
-
-    # Call the function to get the Analysis Report from LLM (Groq)
-    report = get_report(st.session_state.resume,st.session_state.job_desc)
-    missing_skills = extract_missing_skills_from_ai_section(report)
-
-    # Calculate the Average Score from the LLM Report
-    report_scores = extract_scores(report)                 # Example : [3/5, 4/5, 5/5,...]
-    avg_score = (sum(report_scores) / (5*len(report_scores)))*100  # Example: 2.4
-
+        ats_place = st.empty()
 
     with col2:
         st.write("Total Average score according to our AI report:")
-        st.subheader(str(avg_score))
-    score_place.success("Scores generated successfully!")
-    
+        avg_place = st.empty()
+
+    # Missing skills from the local skill taxonomy are ready in milliseconds, before the AI report
+    with stage("skill_match"):
+        local_missing_skills = find_missing_skills(resume, job_desc)
+    st.session_state.skills = local_missing_skills[:5]  # the course and edit pages can use them right away
+    if local_missing_skills:
+        st.write("🧩 Skills in the Job Description that your resume does not mention:")
+        st.markdown(" ".join(f"`{skill}`" for skill in local_missing_skills[:10]))
+        if st.button("📚 View Courses for these Skills"):
+            st.switch_page("pages/2_View Course Recommendations.py")
+
     st.subheader("AI Generated Analysis Report:")
+    report_place = st.empty()
+
+    # Call the function to get the Analysis Report from LLM (Groq) and show it while it arrives,
+    # the parser keeps the scores and missing skills up to date chunk by chunk
+    parser = ReportParser()
+    last_draw = 0.0
+    budget_stats = {}
+    try:
+        for chunk in stream_report(resume,job_desc,budget_stats):
+            parser.feed(chunk)
+            # show the ATS score as soon as it is ready, without waiting for the report to finish
+            if ats_result is None and ats_future.done():
+                ats_result = ats_future.result()
+                ats_place.subheader(str(ats_result[0]))
+            if time.monotonic() - last_draw > 0.1:   # redraw at most 10 times a second
+                render_report(report_place, parser.text)
+                if parser.scores:
+                    avg_place.subheader(str(parser.average_score()))
+                last_draw = time.monotonic()
+    except LLMError as e:
+        if ats_result is None:
+            ats_place.subheader(str(ats_future.result()[0]))
+        st.error(f"⚠️ {e}")
+        profile.stop()
+        st.stop()
+    parser.finish()
+    if budget_stats:
+        st.caption(
+            f"Prompt: {budget_stats['tokens_after']} tokens ({budget_stats['tokens_saved']} saved by cleaning"
+            + (f", {budget_stats['dropped_sections']} less relevant resume sections left out" if budget_stats["dropped_sections"] else "")
+            + ")"
+        )
+
+    if ats_result is None:
+        ats_result = ats_future.result()
+        ats_place.subheader(str(ats_result[0]))
+    ats_score, alignment = ats_result
+
+    report = parser.text
+    # the AI list when the report has one, otherwise the local list
+    missing_skills = parser.missing_skills or local_missing_skills[:5]
+
+    # Average Score from the LLM Report, Example : [3/5, 4/5, 5/5,...] -> 80.0
+    avg_score = parser.average_score()
+    avg_place.subheader(str(avg_score))
+    score_place.success("Scores generated successfully!")
 
     # Displaying Report 
-    st.markdown(f"""
-            <div style='text-align: left; background-color: white; padding: 10px; border-radius: 10px; margin: 5px 0;'>
-                {report}
-            </div>
-            """, unsafe_allow_html=True)
-    
-    
+    render_report(report_place, report)
+
+    # Which part of the resume best covers each part of the job description (comes from the ATS scoring, no extra model call)
+    if alignment is not None:
+        with st.expander("🔍 How your resume sections match the Job Description"):
+            best_rows = alignment["matrix"].argmax(axis=0)
+            st.dataframe(
+                [
+                    {
+                        "Job Description part": jd_chunk[:150],
+                        "Best matching resume part": alignment["resume_chunks"][row][:150],
+                        "Match %": round(float(alignment["matrix"][row, column]) * 100, 1),
+                    }
+                    for column, (jd_chunk, row) in enumerate(zip(alignment["jd_chunks"], best_rows))
+                ],
+                hide_index=True,
+            )
+
+    # Other jobs from the local job library that match this resume (the resume embedding is already cached)
+    try:
+        # search() picks up postings added since the server started and returns [] for an empty library
+        matching_jobs = get_job_index().search(resume, k=10)
+    except ValueError as e:
+        # e.g. the library was built with another model, the analysis is still complete without it
+        matching_jobs = []
+        st.caption(f"💼 Job matches are not available: {e}")
+    if matching_jobs:
+        with st.expander("💼 Other jobs that match your resume"):
+            for job in matching_jobs:
+                title = f"[{job['title'] or job['id']}]({job['url']})" if job["url"] else (job["title"] or job["id"])
+                st.markdown(f"**{job['score']:.1f}** · {title} {('· ' + job['company']) if job['company'] else ''}")
+
+    record("analysis", time.perf_counter() - analysis_start)
+    if profile.stop():
+        st.caption(f"🔬 Profile saved to {profile.path}")
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -190,14 +229,12 @@ if st.session_state.form_submitted:
 
         # Button: Builded Resume
         if missing_skills and st.button("🤖 Edit Resume with AI"):
-            st.session_state.resume_text = st.session_state.resume
             st.session_state.skills = missing_skills
             st.switch_page("pages/3_Edit Resume with AI.py")
 
         # Button: Build Resume
         if st.button("🛠 Edit Resume with Docs"):
             st.session_state.skills = missing_skills
-            st.session_state.resume_text = st.session_state.resume
             st.switch_page("pages/4_Edit Resume with Docs.py")
 
 
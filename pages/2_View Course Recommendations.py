@@ -1,7 +1,7 @@
 import os, urllib.parse as ul
 import streamlit as st
 from dotenv import load_dotenv
-from googleapiclient.discovery import build # used for youtube API
+from utils.youtube import search_courses_for_skills # concurrent, cached YouTube searches
 
 # lodes the API from the environment
 load_dotenv()
@@ -11,9 +11,6 @@ if not YOUTUBE_KEY:
     st.error("❌ YOUTUBE_API_KEY not found in your .env file.")
     st.stop()
 
-# creates the object in youtube developer for the search 
-yt = build("youtube", "v3", developerKey=YOUTUBE_KEY)
-
 st.title("📚 Course Recommendations")
 # fetch the missing skills from reusme analyzer page 
 skills = st.session_state.get("skills", [])
@@ -24,23 +21,6 @@ if not skills:
 
 st.markdown("These course recommendations are based on the missing skills extracted from your resume vs. the job description.")
 
-# search courses 
-# used to temporarily store cache the output of the YouTube API function for 1 hour. 
-# It avoids repeated API calls for the same skill, making the app faster and more efficient
-@st.cache_data(ttl=3600)
-def search_youtube_courses(skill, max_results=5):
-    try:
-        req = yt.search().list(
-            q=f"{skill} full course tutorial",
-            part="snippet",
-            type="video",
-            maxResults=max_results
-        ).execute()
-        return req.get("items", [])
-    except Exception as e:
-        st.warning(f"🔴 YouTube API Error: {e}")
-        return []
-
 # the API result is shown in card format
 def show_course_card(video):
     title = video["snippet"]["title"]
@@ -64,11 +44,18 @@ def show_course_card(video):
             )
     st.markdown("---")
 
+# search the top 5 skills at the same time, results are cached on disk so repeated skills cost no API quota
+with st.spinner("Searching YouTube courses..."):
+    results = search_courses_for_skills(skills[:5])
+
 # show the result for the missing skills 
-for skill in skills[:5]:  # Show top 5 skills
+for skill, (videos, status) in results.items():
     st.subheader(f"🔎 {skill.title()}")
 
-    videos = search_youtube_courses(skill)
+    if status == "stale":
+        st.caption("⚠️ YouTube is unavailable or its daily quota is nearly used up, showing saved results.")
+    elif status not in ("cached", "fresh"):
+        st.warning(f"🔴 {status}")
     if videos:
         for video in videos:
             show_course_card(video)
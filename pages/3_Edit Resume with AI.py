@@ -1,98 +1,138 @@
 import streamlit as st
-import os
-from dotenv import load_dotenv
-from groq import Groq
-from fpdf import FPDF
-import tempfile
-import base64
+from functools import partial # the PDFs are only rendered when a download button is clicked
+from utils.report import stream_completion # Groq call, streamed and cached
+from utils.report_cache import suggestion_cache # suggestions already generated for the same resume
+from utils.live_score import LiveScorer # ATS score that follows the edits
+from utils.pdf_render import render_resume_pdf # resume text -> PDF bytes
+from utils.prompt_budget import fit_prompt, token_budget # keep the prompt within the model budget
+from utils.artifacts import set_session_artifact, get_session_artifact # large texts are shared, the session keeps handles
+
+SUGGESTION_MODEL = "llama3-8b-8192" # Groq model used for the resume suggestions
+IMPROVE_PROMPT = """
+You are a resume improvement assistant. Improve grammar, tone, and professionalism of the following resume:
+
+{resume}
+
+Return stronger lines, refined grammar, and professional phrasing.
+"""
 
-# load environment variables
-load_dotenv()
-api_key = os.getenv("GROQ_API_KEY")
+def build_improve_prompt(resume, job_desc):
+    return IMPROVE_PROMPT.format(resume=resume)
 
 # Ensure resume exists
-if "resume" not in st.session_state or not st.session_state.resume:
+resume_text = get_session_artifact("resume")
+if not resume_text:
     st.warning("⚠️ Missing resume. Please analyze a resume first.")
     st.stop()
 
-resume_text = st.session_state.resume
 skills = st.session_state.get("skills", [])
+job_desc = get_session_artifact("job_desc", "")
 
 # -------------------------------
 # 📝 Edit Resume Section
 # -------------------------------
 st.subheader("📝 Edit Your Resume Inline")
 edited_resume = st.text_area("Edit your full resume below:", resume_text, height=600)
-st.session_state.updated_resume = edited_resume  # Store in session for use elsewhere
+edited_handle = set_session_artifact("updated_resume", edited_resume)  # Store in session for use elsewhere
+
+# -------------------------------
+# 📈 Live ATS Score
+# -------------------------------
+if job_desc:
+    # one scorer per session, it keeps the JD embedding and the embeddings of the unchanged sections
+    # (it is given the artifact handles, not the texts)
+    scorer = st.session_state.get("live_scorer")
+    if scorer is None or scorer.job_desc != st.session_state.job_desc:
+        scorer = st.session_state.live_scorer = LiveScorer(st.session_state.job_desc)
+    scorer.request(edited_handle)
+
+    # only this small panel refreshes, every half second and only while the newest edit is being scored
+    polling = scorer.error is None and (scorer.pending or scorer.result is None)
+
+    @st.fragment(run_every=0.5 if polling else None)
+    def live_score_panel():
+        result = scorer.result
+        if scorer.error is not None:
+            st.warning(f"⚠️ Live score error: {scorer.error}")
+        elif result is None:
+            st.info("Scoring your resume...")
+        else:
+            first_score = st.session_state.setdefault("live_score_start", result["score"])
+            st.metric("📈 Live ATS Score", f"{result['score']:.1f}", delta=f"{result['score'] - first_score:+.1f}")
+            st.caption(
+                f"{result['changed']} of {result['chunks']} sections re-embedded in {result['ms']:.0f} ms"
+                + (" · updating..." if scorer.pending else "")
+            )
+        # scored (or failed): rerun the page once, it then draws this panel without the timer
+        if polling and (scorer.error is not None or not (scorer.pending or scorer.result is None)):
+            st.rerun()
+
+    live_score_panel()
 
 # -------------------------------
 # 💡 AI Suggestions Section
 # -------------------------------
 st.subheader("💡 AI Suggestions to Improve Resume")
-improve_prompt = f"""
-You are a resume improvement assistant. Improve grammar, tone, and professionalism of the following resume:
 
-{resume_text}
-
-Return stronger lines, refined grammar, and professional phrasing.
-"""
-
-try:
-    suggestion = Groq(api_key=api_key).chat.completions.create(
-        messages=[{"role": "user", "content": improve_prompt}],
-        model="llama3-8b-8192",
-    ).choices[0].message.content
-
-    st.session_state.generated_resume = suggestion
+# Suggestions only depend on the original resume, the JD (it decides which sections fit the prompt budget),
+# the model and the prompt, not on the edits above, so they are generated once and then served from the cache
+suggestion_key = suggestion_cache.make_key(
+    resume_text, job_desc, SUGGESTION_MODEL, IMPROVE_PROMPT, token_budget(SUGGESTION_MODEL)
+)
+suggestion = suggestion_cache.get(suggestion_key)
+
+if suggestion is None:
+    # still marked as running means the last stream was cut off (Stop button or another widget)
+    if st.session_state.get("suggestion_running"):
+        st.session_state.suggestion_running = False
+        st.info("⏹ Suggestion generation stopped.")
+
+    if st.button("✨ Generate AI Suggestions"):
+        st.session_state.suggestion_running = True
+        # clicking Stop reruns the page, which ends this stream; unfinished suggestions are not cached
+        st.button("⏹ Stop")
+        try:
+            # cleaned resume; when it is too long for the model, the sections least relevant to the JD are left out
+            improve_prompt, budget_stats = fit_prompt(
+                build_improve_prompt, resume_text, job_desc, SUGGESTION_MODEL
+            )
+            if budget_stats["dropped_sections"]:
+                st.caption(f"Resume too long for the model: {budget_stats['dropped_sections']} least relevant sections left out.")
+            with st.expander("📋 View AI Suggested Resume", expanded=True):
+                suggestion_place = st.empty()
+                parts = []
+                for chunk in stream_completion(improve_prompt, SUGGESTION_MODEL, suggestion_cache, suggestion_key):
+                    parts.append(chunk)
+                    suggestion_place.markdown("".join(parts))
+            st.session_state.suggestion_running = False
+            st.rerun()  # show the finished suggestions from the cache, without the Stop button
+        except Exception as e:
+            st.session_state.suggestion_running = False
+            st.error(f"⚠️ AI Suggestion Error: {e}")
+else:
+    set_session_artifact("generated_resume", suggestion)
 
     with st.expander("📋 View AI Suggested Resume"):
         st.markdown(suggestion)
 
-except Exception as e:
-    st.error(f"⚠️ AI Suggestion Error: {e}")
-    suggestion = None
-
 # -------------------------------
 # 📥 Download AI Suggested Resume
 # -------------------------------
-if suggestion and st.button("📄 Download AI Suggested Resume as PDF"):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=True, margin=10)
-    pdf.set_font("Arial", size=12)
-
-    for line in suggestion.strip().split("\n"):
-        try:
-            pdf.multi_cell(0, 10, txt=line.encode("latin-1", "replace").decode("latin-1"))
-        except:
-            continue
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        pdf.output(tmp_file.name)
-        with open(tmp_file.name, "rb") as f:
-            base64_pdf = base64.b64encode(f.read()).decode("utf-8")
-            download_link = f'<a href="data:application/pdf;base64,{base64_pdf}" download="AI_Suggested_Resume.pdf">📄 Click to Download AI-Suggested Resume</a>'
-            st.markdown(download_link, unsafe_allow_html=True)
+if suggestion:
+    st.download_button(
+        label="📄 Download AI Suggested Resume as PDF",
+        data=partial(render_resume_pdf, suggestion),
+        file_name="AI_Suggested_Resume.pdf",
+        mime="application/pdf",
+    )
 
 # -------------------------------
 # 📥 Download Edited Resume
 # -------------------------------
-if st.button("📥 Download Edited Resume as PDF"):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=True, margin=10)
-    pdf.set_font("Arial", size=12)
-
-    for line in edited_resume.strip().split("\n"):
-        try:
-            pdf.multi_cell(0, 10, txt=line.encode("latin-1", "replace").decode("latin-1"))
-        except:
-            continue
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        pdf.output(tmp_file.name)
-        with open(tmp_file.name, "rb") as f:
-            base64_pdf = base64.b64encode(f.read()).decode("utf-8")
-            download_link = f'<a href="data:application/pdf;base64,{base64_pdf}" download="Edited_Resume.pdf">📥 Click to Download Edited Resume</a>'
-            st.markdown(download_link, unsafe_allow_html=True)
-
+# rendered in memory when the button is clicked (not on every edit), and cached by content
+st.download_button(
+    label="📥 Download Edited Resume as PDF",
+    data=partial(render_resume_pdf, edited_resume),
+    file_name="Edited_Resume.pdf",
+    mime="application/pdf",
+)
@@ -1,23 +1,18 @@
 import streamlit as st
 import os
-from dotenv import load_dotenv
-from groq import Groq
 
 # Import Google API client libraries
-from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 import os.path
-import json
-import time # Import time for potential delays
+import hashlib # exported documents are remembered by a hash of the resume
+from utils.gdocs import build_drive, get_user_id, export_resume, export_resumes, doc_url as gdoc_url # Drive export
+from utils.pdf_text import extract_text_from_pdf # bulk export accepts resume PDFs
+from utils.artifacts import get_session_artifact # the resume text kept by the analyzer page
 
 
 # --- Configuration ---
-# Load environment variables from .env file (e.g., GROQ_API_KEY)
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
 
 # --- Google OAuth 2.0 Client ID Setup ---
 # This file contains your client_id, client_secret, etc.
@@ -39,11 +34,11 @@ TARGET_FOLDER_ID = "your folder id"
 
 # --- Resume Content Validation ---
 # resume data
-if "resume" not in st.session_state or not st.session_state.resume:
+resume_text = get_session_artifact("resume")
+if not resume_text:
     st.warning("⚠️ Missing resume. Please analyze a resume first.")
     st.stop() # Stop execution if no resume data is found
 
-resume_text = st.session_state.resume
 
 # --- Google Authentication Function ---
 def get_google_credentials():
@@ -52,10 +47,13 @@ def get_google_credentials():
     It attempts to load existing tokens, refreshes them if expired, or
     initiates a new authentication flow if no valid tokens are found.
     """
-    creds = None
-    
+    # 0. Credentials already loaded in this session are reused, the token file is only read once
+    creds = st.session_state.get("google_credentials")
+    if creds is not None and creds.valid:
+        return creds
+
     # 1. Check if a token file exists (for subsequent runs)
-    if os.path.exists(TOKEN_FILE):
+    if creds is None and os.path.exists(TOKEN_FILE):
         try:
             creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
             st.info("Loaded existing Google credentials.")
@@ -99,76 +97,70 @@ def get_google_credentials():
                     token.write(creds.to_json())
             except Exception as e:
                 st.warning(f"Could not save token file: {e}. You may need to re-authenticate next time.")
+    st.session_state.google_credentials = creds
     return creds
 
 # --- Main Application Logic ---
 
-# Get Google credentials (this will trigger the OAuth flow if needed)
+# Get Google credentials (this will trigger the OAuth flow if needed), kept in the session after the first time
 st.title("🛠 Edit Resume with Docs")
 credentials = get_google_credentials()
 
-# Build Google Docs and Drive service clients
-# These services are built only after successful authentication
-docs_service = build("docs", "v1", credentials=credentials)
-drive_service = build("drive", "v3", credentials=credentials)
-
-st.header("Generating and Uploading Resume...")
-
-# Step 1: Create a new Google Doc
-document_id = None
-try:
-    with st.spinner("Creating new Google Doc..."):
-        doc = docs_service.documents().create(body={"title": "AI Editable Resume"}).execute()
-        document_id = doc["documentId"]
-    st.success(f"✅ Document created successfully! Document ID: {document_id}")
-except Exception as e:
-    st.error(f"❌ Error creating document: {e}")
-    st.stop() # Stop if document creation fails
-
-# Step 2: Insert resume content into the created document
-if document_id:
-    try:
-        with st.spinner("Inserting resume content..."):
-            docs_service.documents().batchUpdate(
-                documentId=document_id,
-                body={"requests": [{"insertText": {"location": {"index": 1}, "text": resume_text}}]}
-            ).execute()
-        st.success("✅ Resume content inserted into document.")
-    except Exception as e:
-        st.error(f"❌ Error inserting content into document: {e}")
-        # Attempt to clean up: delete the partially created document
-        if document_id:
-            try:
-                drive_service.files().delete(fileId=document_id).execute()
-                st.info("Cleaned up partially created document.")
-            except Exception as cleanup_e:
-                st.warning(f"Failed to clean up document: {cleanup_e}")
-        st.stop()
-
-# Step 3: Move the document to the specified Google Drive folder
-if document_id and TARGET_FOLDER_ID:
+# Build the Drive client once per session (the Docs API is not needed, Drive converts the text into a Doc)
+if st.session_state.get("drive_credentials") is not credentials:
+    st.session_state.drive_service = build_drive(credentials)
+    st.session_state.drive_credentials = credentials
+    st.session_state.google_user = None
+    st.session_state.exported_docs = {}
+drive_service = st.session_state.drive_service
+if not st.session_state.get("google_user"):
+    st.session_state.google_user = get_user_id(drive_service)
+
+# Create the Google Doc with the resume in it, directly inside the target folder, in one request.
+# The same resume is only exported once per user: reruns and later visits reuse the document.
+doc_ids = st.session_state.setdefault("exported_docs", {})
+resume_key = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+document_id = doc_ids.get(resume_key)
+if document_id is None:
     try:
-        with st.spinner(f"Moving document to folder ID: {TARGET_FOLDER_ID}..."):
-            drive_service.files().update(
-                fileId=document_id,
-                addParents=TARGET_FOLDER_ID,
-                removeParents="root", # Remove from the root folder (default location)
-                fields="id, parents" # Request these fields back for confirmation
-            ).execute()
-        st.success("✅ Document moved to your designated Google Drive folder.")
+        with st.spinner("Creating your Google Doc..."):
+            document_id, created = export_resume(
+                drive_service, st.session_state.google_user, resume_text, "AI Editable Resume", TARGET_FOLDER_ID or None
+            )
+        doc_ids[resume_key] = document_id
+        st.success("✅ Document created in your Google Drive folder." if created else "✅ Found the document created earlier for this resume.")
     except Exception as e:
-        st.error(f"❌ Error moving document to folder (ID: {TARGET_FOLDER_ID}): {e}")
-        st.warning("The document might still be in your Google Drive's root folder.")
-        st.stop()
-
-# Step 4: Display the editable link to the Google Doc
-if document_id:
-    doc_url = f"https://docs.google.com/document/d/{document_id}/edit"
-    st.success("🎉 Resume process complete! Your AI-generated resume is ready.")
-    st.markdown(f"### [📝 Click here to Edit Your Resume in Google Docs]({doc_url})", unsafe_allow_html=True)
-else:
-    st.error("Could not generate a link as document creation failed.")
-
-
-
-
+        st.error(f"❌ Error creating document: {e}")
+        st.stop() # Stop if document creation fails
+
+# Display the editable link to the Google Doc
+doc_url = gdoc_url(document_id)
+st.success("🎉 Resume process complete! Your AI-generated resume is ready.")
+st.markdown(f"### [📝 Click here to Edit Your Resume in Google Docs]({doc_url})", unsafe_allow_html=True)
+
+# --- Bulk export ---
+st.header("📦 Export many resumes")
+with st.form("bulk_export"):
+    files = st.file_uploader("Resume PDFs or text files", type=["pdf", "txt"], accept_multiple_files=True)
+    submitted = st.form_submit_button("Export all to Google Docs")
+
+if submitted and files:
+    resumes = {}
+    for file in files:
+        title = os.path.splitext(file.name)[0]
+        try:
+            resumes[title] = extract_text_from_pdf(file) if file.name.lower().endswith(".pdf") else file.getvalue().decode("utf-8", "replace")
+        except Exception as e:
+            st.warning(f"Skipped {file.name}: {e}")
+
+    progress_bar = st.progress(0.0, text="Exporting...")
+    rows = []
+    # several exports run at the same time, within the Drive write quota (GDOCS_WRITES_PER_MINUTE)
+    for title, result in export_resumes(credentials, st.session_state.google_user, resumes, TARGET_FOLDER_ID or None):
+        rows.append({
+            "resume": title,
+            "document": gdoc_url(result["doc_id"]) if result["doc_id"] else "",
+            "status": result["error"] or ("created" if result["created"] else "already exported"),
+        })
+        progress_bar.progress(len(rows) / len(resumes), text=f"{len(rows)}/{len(resumes)} exported")
+    st.dataframe(rows, hide_index=True, column_config={"document": st.column_config.LinkColumn("document")})
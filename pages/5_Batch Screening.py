@@ -0,0 +1,60 @@
+import streamlit as st
+import hashlib # name the work folder after the upload so a stopped run can continue
+import os
+from utils.batch import screen_resumes, rank_results # batch pipeline shared with the command line tool
+from utils.cache import CACHE_DIR # work files are kept next to the other caches
+from utils.telemetry import stage # timings for the metrics page
+from utils.llm import LLMError # friendly message when the AI service is busy or failing
+
+st.title("📂 Batch Resume Screening")
+st.markdown("Upload a ZIP file of resume PDFs and one job description to rank every resume by ATS score.")
+
+with st.form("batch_form"):
+    zip_file = st.file_uploader(label="Upload a ZIP file with resumes in PDF format", type="zip")
+    job_desc = st.text_area("Enter the Job Description:", placeholder="Job Description...")
+    top_k = st.number_input("Generate the AI report for the top K resumes", min_value=0, max_value=50, value=0)
+    submitted = st.form_submit_button("Screen Resumes")
+
+if submitted:
+    if not (zip_file and job_desc):
+        st.warning("Please Upload both the ZIP file and the Job Description")
+        st.stop()
+
+    # same ZIP + job description -> same folder, so the results already written are reused
+    zip_bytes = zip_file.getvalue()
+    run_id = hashlib.sha256(zip_bytes + job_desc.encode("utf-8")).hexdigest()[:16]
+    work_dir = os.path.join(CACHE_DIR, "batch", run_id)
+    os.makedirs(work_dir, exist_ok=True)
+    zip_path = os.path.join(work_dir, "resumes.zip")
+    if not os.path.exists(zip_path):
+        with open(zip_path, "wb") as f:
+            f.write(zip_bytes)
+    results_path = os.path.join(work_dir, "results.csv")
+    ranked_path = os.path.join(work_dir, "ranked.csv")
+
+    progress_bar = st.progress(0.0, text="Extracting and scoring resumes...")
+
+    def show_progress(done, total, rate):
+        progress_bar.progress(done / total, text=f"{done}/{total} resumes · {rate:.1f} resumes/sec")
+
+    with stage("batch_screening"):
+        stats = screen_resumes(zip_path, job_desc, results_path, progress=show_progress)
+    progress_bar.progress(1.0, text="Scoring done")
+    st.success(
+        f"✅ Screened {stats['processed']} resumes ({stats['skipped']} already done) "
+        f"in {stats['seconds']:.1f}s · {stats['resumes_per_sec']:.1f} resumes/sec"
+    )
+
+    with st.spinner(f"Ranking resumes{' and generating AI reports' if top_k else ''}..."), stage("batch_ranking"):
+        try:
+            ranking = rank_results(results_path, ranked_path, zip_path, job_desc, int(top_k))
+        except LLMError as e:
+            # the ATS ranking does not need the AI service, show it without the reports
+            st.error(f"⚠️ {e}")
+            ranking = rank_results(results_path, ranked_path)
+
+    st.subheader("🏆 Ranking")
+    st.dataframe(ranking.drop(columns=["report"], errors="ignore").head(100), hide_index=True)
+
+    with open(ranked_path, "rb") as f:
+        st.download_button(label="Download Ranking (CSV)", data=f.read(), file_name="ranking.csv")
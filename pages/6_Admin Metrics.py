@@ -0,0 +1,63 @@
+import os
+import streamlit as st
+from dotenv import load_dotenv
+from utils.telemetry import stage_stats, counters, prometheus_text, TELEMETRY_LOG, TELEMETRY_PORT # stage timings
+from utils.llm import llm_metrics # Groq queue, retries and latency
+from utils.prompt_budget import budget_metrics # tokens saved by prompt compaction
+from utils.report_cache import report_cache, suggestion_cache # AI answer cache hit rates
+from utils.artifacts import artifact_store # resume texts and other large values kept for the sessions
+
+load_dotenv()
+ADMIN_METRICS = os.getenv("ADMIN_METRICS", "0") == "1"  # the page is only shown when this is turned on
+
+st.title("📈 Admin Metrics")
+
+if not ADMIN_METRICS:
+    st.info("This page is turned off. Set ADMIN_METRICS=1 in the .env file to see the server metrics.")
+    st.stop()
+
+st.caption(
+    "Timings of every stage in this server process (last 1000 runs per stage)."
+    + (f" JSONL log: `{TELEMETRY_LOG}`." if TELEMETRY_LOG else "")
+    + (f" Prometheus: `http://<host>:{TELEMETRY_PORT}/metrics`." if TELEMETRY_PORT else "")
+    + " Add `?profile=1` to the Resume Analyzer URL to profile one analysis."
+)
+
+
+# refreshes by itself every 2 seconds
+@st.fragment(run_every=2)
+def metrics_panel():
+    stats = stage_stats()
+    st.subheader("⏱ Stages")
+    if stats:
+        st.dataframe(
+            [{"stage": name, **{key: round(value, 1) for key, value in row.items()}} for name, row in stats.items()],
+            hide_index=True,
+        )
+    else:
+        st.info("Nothing recorded yet, run an analysis first.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("🔢 Counters")
+        st.json(counters())
+        st.subheader("🗂 AI caches")
+        st.json({"reports": report_cache.stats(), "suggestions": suggestion_cache.stats()})
+    with col2:
+        st.subheader("🤖 Groq")
+        st.json(llm_metrics())
+        st.subheader("✂️ Prompt budget")
+        st.json(budget_metrics())
+
+    st.subheader("🧠 Session memory")
+    st.json(artifact_store.stats())
+    sessions = artifact_store.sessions_report()
+    if sessions:
+        # shared_bytes: content other sessions use too, stored only once
+        st.dataframe([{"session": session_id[:8], **report} for session_id, report in sessions.items()], hide_index=True)
+
+
+metrics_panel()
+
+with st.expander("Prometheus text"):
+    st.code(prometheus_text(), language="text")
@@ -0,0 +1,109 @@
+import os # read the scoring mode from the environment
+import sys # CLI exit code
+import json # CLI output
+import argparse # command line options
+from dotenv import load_dotenv # extract settings from .env file
+from utils.pdf_text import extract_text_from_pdf # extract text from pdf
+from utils.embeddings import encode_texts_cached, cosine_scores # shared SentenceTransformer model + embedding cache
+from utils.chunking import chunked_similarity, chunked_scores # score long documents window by window instead of truncating
+from utils.report import get_report # Groq analysis report (cached)
+from utils.report_parser import ReportParser, extract_scores, extract_missing_skills_from_ai_section # read the report
+from utils.skills import find_missing_skills # local skill taxonomy matcher, no LLM needed
+from utils.telemetry import stage # ATS score timing
+
+load_dotenv()
+ATS_SCORING_MODE = os.getenv("ATS_SCORING_MODE", "full") # "full" (one embedding per document) or "chunked"
+
+# The analysis steps of the Resume Analyzer page without Streamlit, used by the page, the API (utils.api) and the CLI below
+
+__all__ = [
+    "extract_pdf_text",
+    "calculate_similarity_bert",
+    "ats_scores",
+    "get_report",
+    "extract_scores",
+    "extract_missing_skills_from_ai_section",
+    "analyze",
+]
+
+
+# Text of a resume PDF (path, bytes or file-like object); raises ValueError when the PDF cannot be read
+def extract_pdf_text(source):
+    return extract_text_from_pdf(source)
+
+
+# Function to calculate similarity
+#Convert both texts into numerical vectors using BERT, These vectors represent the meaning of the texts in mathematical terms.
+# In "chunked" mode both documents are split into windows so nothing after the model's token limit is ignored,
+# with return_alignment=True it also returns which resume chunks match which JD chunks (None in "full" mode).
+# encode can be swapped for a micro-batcher (see utils.microbatch) when many requests are scored at once.
+@stage("ats_score")
+def calculate_similarity_bert(text1, text2, return_alignment=False, encode=encode_texts_cached):
+    if ATS_SCORING_MODE == "chunked":
+        similarity, alignment = chunked_similarity(text1, text2, encode=encode)
+        return (similarity, alignment) if return_alignment else similarity
+
+    similarity = ats_scores([text1], text2, encode)[0]
+    return (similarity, None) if return_alignment else similarity
+
+
+# ATS scores of many resumes against one job description, the same numbers calculate_similarity_bert gives.
+# Every scoring path (analyzer, batch screening, live score, backend check) goes through here, so they all agree.
+def ats_scores(resumes, job_desc, encode=encode_texts_cached):
+    resumes = list(resumes)
+    if ATS_SCORING_MODE == "chunked":
+        return chunked_scores(resumes, job_desc, encode=encode)
+
+    # Encode all texts to embeddings in one batched call (texts seen before come from the cache)
+    #Resume text	→ SentenceTransformer	→ Embedding Vector A
+    #Job description	→ SentenceTransformer	→ Embedding Vector B
+    #A & B → cosine_similarity	→ Score (0.0–1.0)	e.g. 0.83
+    embeddings = encode(resumes + [job_desc])
+    return list(cosine_scores(embeddings[:-1], embeddings[-1]))   # already multiplied by 100
+
+
+# Everything the analyzer page shows, as a dict that can be sent as JSON
+def analyze(resume, job_desc, with_report=True, encode=encode_texts_cached):
+    result = {
+        "ats_score": round(float(calculate_similarity_bert(resume, job_desc, encode=encode)), 2),
+        "local_missing_skills": find_missing_skills(resume, job_desc),
+    }
+    if with_report:
+        parser = ReportParser()
+        parser.feed(get_report(resume, job_desc))
+        parser.finish()
+        result.update({
+            "ai_scores": parser.scores,
+            "ai_average_score": round(parser.average_score(), 2),
+            "missing_skills": parser.missing_skills or result["local_missing_skills"][:5],
+            "report": parser.text,
+        })
+    else:
+        result["missing_skills"] = result["local_missing_skills"][:5]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze one resume against a job description (same results as the Resume Analyzer page).")
+    parser.add_argument("resume", help="resume PDF (or .txt with the resume text)")
+    parser.add_argument("--jd", required=True, help="text file with the job description")
+    parser.add_argument("--no-report", action="store_true", help="skip the Groq report, only the local ATS score and skills")
+    args = parser.parse_args(argv)
+
+    if args.resume.lower().endswith(".pdf"):
+        try:
+            resume = extract_pdf_text(args.resume)
+        except Exception as e:
+            print(f"Could not extract text from {args.resume}: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        with open(args.resume, encoding="utf-8") as f:
+            resume = f.read()
+    with open(args.jd, encoding="utf-8") as f:
+        job_desc = f.read()
+
+    print(json.dumps(analyze(resume, job_desc, with_report=not args.no_report), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
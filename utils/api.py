@@ -0,0 +1,105 @@
+import os # read the API settings from the environment
+import asyncio # the endpoints wait for the worker threads without blocking the event loop
+import argparse # command line options
+from contextlib import asynccontextmanager # start-up work of the service
+from concurrent.futures import ThreadPoolExecutor # workers share the one model loaded in this process
+from dotenv import load_dotenv # extract settings from .env file
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile # HTTP service (fastapi, uvicorn, python-multipart in requirements.txt)
+from pydantic import BaseModel # request bodies
+from utils.analysis import extract_pdf_text, calculate_similarity_bert, analyze # the analysis steps of the analyzer page
+from utils.llm import LLMError # Groq busy / failing
+from utils.microbatch import get_batcher # concurrent requests are encoded together
+from utils.warmup import start_warmup, warmup_state # load the model when the service starts
+
+load_dotenv()
+
+# threads running the analyses; they all use the same model, embeddings of concurrent requests are micro-batched
+API_WORKERS = int(os.getenv("API_WORKERS", "16"))
+
+_executor = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="api-worker")
+
+
+# load the model as soon as the service starts, /health reports when it is ready
+@asynccontextmanager
+async def lifespan(app):
+    start_warmup()
+    yield
+
+
+app = FastAPI(title="SkillGap Radar API", description="Resume analysis without the Streamlit UI", lifespan=lifespan)
+
+
+class AnalyzeRequest(BaseModel):
+    resume: str
+    job_desc: str
+    report: bool = True  # False skips the Groq report (faster, local score and skills only)
+
+
+class ScoreRequest(BaseModel):
+    resume: str
+    job_desc: str
+
+
+async def _run(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, lambda: fn(*args, **kwargs))
+
+
+# 200 once the model is loaded, 503 while it is still loading (or could not be loaded).
+# With MODEL_WARMUP=0 the state stays "idle": the service is healthy and loads the model on the first request.
+@app.get("/health")
+async def health():
+    state = warmup_state()
+    if state["status"] in ("warming", "failed"):
+        raise HTTPException(status_code=503, detail=state)
+    return state
+
+
+@app.post("/score")
+async def score(request: ScoreRequest):
+    similarity = await _run(calculate_similarity_bert, request.resume, request.job_desc, encode=get_batcher().encode)
+    return {"ats_score": round(float(similarity), 2)}
+
+
+@app.post("/analyze")
+async def analyze_text(request: AnalyzeRequest):
+    try:
+        return await _run(analyze, request.resume, request.job_desc, request.report, encode=get_batcher().encode)
+    except LLMError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@app.post("/extract")
+async def extract(resume: UploadFile = File(...)):
+    data = await resume.read()
+    try:
+        return {"text": await _run(extract_pdf_text, data)}
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Could not extract text from the PDF: {e}")
+
+
+@app.post("/analyze/pdf")
+async def analyze_pdf(resume: UploadFile = File(...), job_desc: str = Form(...), report: bool = Form(True)):
+    data = await resume.read()
+    try:
+        text = await _run(extract_pdf_text, data)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Could not extract text from the PDF: {e}")
+    try:
+        return await _run(analyze, text, job_desc, report, encode=get_batcher().encode)
+    except LLMError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def main(argv=None):
+    import uvicorn # ASGI server, only needed to run the service
+    parser = argparse.ArgumentParser(description="Run the SkillGap Radar analysis API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    # one process: every worker thread shares the same model and caches (more processes = more copies of the model)
+    uvicorn.run(app, host=args.host, port=args.port, workers=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import os # read the artifact store settings from the environment
+import io # numpy arrays are saved to bytes
+import atexit # remove the spilled files when the server stops
+import shutil # delete spill folders
+import time # last used times for spilling and session expiry
+import hashlib # artifacts are stored by a hash of their content
+import threading # one store shared by every session of the server
+from collections import OrderedDict # in-memory artifacts in least-recently-used order
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import CACHE_DIR # spilled artifacts are kept next to the other caches
+from utils.telemetry import count # spills, disk reads and evictions
+
+load_dotenv()
+
+# Settings, can be changed from the .env file
+ARTIFACT_MEMORY_MB = int(os.getenv("ARTIFACT_MEMORY_MB", "256"))  # above this, least recently used artifacts move to disk
+ARTIFACT_SESSION_TTL = int(os.getenv("ARTIFACT_SESSION_TTL", str(2 * 3600)))  # seconds an unused session keeps its artifacts
+ARTIFACT_CLOSED_GRACE = 120  # seconds a closed browser tab keeps its artifacts (page reloads reconnect in between)
+ARTIFACT_SWEEP_INTERVAL = 60  # seconds between checks for expired sessions
+ARTIFACT_ROOT = os.path.join(CACHE_DIR, "artifacts")
+ARTIFACT_DIR = os.path.join(ARTIFACT_ROOT, str(os.getpid()))  # spilled files are only valid for this server process
+
+
+# Large values of a session (resume text, reports, rendered PDFs, embeddings) stored once per server process.
+# Sessions keep a small handle ("text:<sha256>") in st.session_state instead of the value itself, so the same
+# resume kept under several keys or uploaded by many users is in memory only once.
+class ArtifactStore:
+    def __init__(self, max_memory=ARTIFACT_MEMORY_MB * 1024 * 1024, session_ttl=ARTIFACT_SESSION_TTL, folder=ARTIFACT_DIR):
+        self.max_memory = max_memory
+        self.session_ttl = session_ttl
+        self.folder = folder
+        self.memory_bytes = 0
+        self._memory = OrderedDict()  # digest -> bytes, least recently used first
+        self._sizes = {}  # digest -> size in bytes, for artifacts in memory and on disk
+        self._refs = {}  # digest -> number of (session, name) pairs pointing to it
+        self._sessions = {}  # session id -> {"names": {name: handle}, "last_seen": time}
+        self._last_sweep = time.time()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, str):
+            return "text", value.encode("utf-8")
+        if isinstance(value, (bytes, bytearray)):
+            return "bytes", bytes(value)
+        import numpy as np # embeddings, only needed when one is stored
+        buffer = io.BytesIO()
+        np.save(buffer, np.asarray(value), allow_pickle=False)
+        return "array", buffer.getvalue()
+
+    @staticmethod
+    def _decode(kind, data):
+        if kind == "text":
+            return data.decode("utf-8")
+        if kind == "bytes":
+            return data
+        import numpy as np
+        return np.load(io.BytesIO(data), allow_pickle=False)
+
+    def _path(self, digest):
+        return os.path.join(self.folder, digest)
+
+    # Store value for a session under name and return its handle; the value the session had under
+    # the same name before is released (and dropped once no session uses it any more)
+    def put(self, session_id, name, value):
+        kind, data = self._encode(value)
+        digest = hashlib.sha256(data).hexdigest()
+        handle = f"{kind}:{digest}"
+        with self._lock:
+            session = self._touch(session_id)
+            old = session["names"].get(name)
+            if old == handle:
+                return handle
+            if digest not in self._sizes:
+                self._sizes[digest] = len(data)
+                self._memory[digest] = data
+                self.memory_bytes += len(data)
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+            session["names"][name] = handle
+            if old is not None:
+                self._unref(old.split(":", 1)[1])
+            self._spill()
+        self.sweep()
+        return handle
+
+    # The value of a handle, or None when it was evicted (session expired)
+    def get(self, handle):
+        if not handle or ":" not in handle:
+            return None
+        kind, digest = handle.split(":", 1)
+        with self._lock:
+            data = self._memory.get(digest)
+            if data is not None:
+                self._memory.move_to_end(digest)
+                return self._decode(kind, data)
+            if digest not in self._sizes:
+                return None
+        # spilled: read it back outside the lock, then keep it in memory again while it is being used
+        try:
+            with open(self._path(digest), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        count("artifact_disk_reads")
+        with self._lock:
+            if digest in self._sizes and digest not in self._memory:
+                self._memory[digest] = data
+                self.memory_bytes += len(data)
+                self._spill()
+        return self._decode(kind, data)
+
+    # Forget every artifact of a session (the artifacts other sessions use are kept)
+    def release(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return
+            for handle in session["names"].values():
+                self._unref(handle.split(":", 1)[1])
+        count("artifact_sessions_evicted")
+
+    # Release sessions not seen for session_ttl seconds, or closed for ARTIFACT_CLOSED_GRACE seconds
+    def sweep(self, force=False):
+        now = time.time()
+        if not force and now - self._last_sweep < ARTIFACT_SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        is_active = _streamlit_session_check()
+        with self._lock:
+            expired = []
+            for session_id, session in self._sessions.items():
+                idle = now - session["last_seen"]
+                if idle > self.session_ttl:
+                    expired.append(session_id)
+                elif is_active is not None and idle > ARTIFACT_CLOSED_GRACE and not is_active(session_id):
+                    expired.append(session_id)
+        for session_id in expired:
+            self.release(session_id)
+
+    def touch(self, session_id):
+        with self._lock:
+            self._touch(session_id)
+        self.sweep()
+
+    def _touch(self, session_id):
+        session = self._sessions.setdefault(session_id, {"names": {}, "last_seen": 0})
+        session["last_seen"] = time.time()
+        return session
+
+    def _unref(self, digest):
+        self._refs[digest] -= 1
+        if self._refs[digest] > 0:
+            return
+        del self._refs[digest]
+        del self._sizes[digest]
+        data = self._memory.pop(digest, None)
+        if data is not None:
+            self.memory_bytes -= len(data)
+        try:
+            os.remove(self._path(digest))  # also when it was read back into memory after a spill
+        except FileNotFoundError:
+            pass
+
+    # move the least recently used artifacts to disk until the ones in memory fit in max_memory
+    def _spill(self):
+        if self.memory_bytes <= self.max_memory:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        while self.memory_bytes > self.max_memory and len(self._memory) > 1:
+            digest, data = self._memory.popitem(last=False)
+            path = self._path(digest)
+            if not os.path.exists(path):  # same content, same file: a second spill has nothing to write
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            self.memory_bytes -= len(data)
+            count("artifact_spills")
+
+    # Memory used by one session: its artifacts, how much of that it shares with other sessions, and where it is
+    def session_report(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return {"artifacts": 0, "bytes": 0, "shared_bytes": 0, "memory_bytes": 0, "disk_bytes": 0, "idle_seconds": None}
+            digests = {handle.split(":", 1)[1] for handle in session["names"].values()}
+            report = {"artifacts": len(digests), "bytes": 0, "shared_bytes": 0, "memory_bytes": 0, "disk_bytes": 0}
+            for digest in digests:
+                size = self._sizes[digest]
+                report["bytes"] += size
+                report["memory_bytes" if digest in self._memory else "disk_bytes"] += size
+                own_refs = sum(1 for handle in session["names"].values() if handle.endswith(digest))
+                if self._refs[digest] > own_refs:  # other sessions use the same content
+                    report["shared_bytes"] += size
+            report["idle_seconds"] = round(time.time() - session["last_seen"], 1)
+            return report
+
+    def sessions_report(self):
+        with self._lock:
+            session_ids = list(self._sessions)
+        return {session_id: self.session_report(session_id) for session_id in session_ids}
+
+    # Totals for the whole store; logical_bytes is what the sessions would hold if every copy were kept
+    def stats(self):
+        with self._lock:
+            logical = sum(
+                self._sizes[handle.split(":", 1)[1]]
+                for session in self._sessions.values()
+                for handle in session["names"].values()
+            )
+            return {
+                "sessions": len(self._sessions),
+                "artifacts": len(self._sizes),
+                "memory_bytes": self.memory_bytes,
+                "disk_bytes": sum(self._sizes.values()) - self.memory_bytes,
+                "logical_bytes": logical,
+                "max_memory_bytes": self.max_memory,
+            }
+
+
+# Streamlit's "is this session still open" check, or None outside a Streamlit server (API, CLI, tests)
+def _streamlit_session_check():
+    try:
+        from streamlit.runtime import Runtime # the running Streamlit server, if any
+        if Runtime.exists():
+            return Runtime.instance().is_active_session
+    except Exception:
+        pass
+    return None
+
+
+def _process_alive(pid):
+    if os.name == "nt":
+        return True  # os.kill would stop the process on Windows; those folders are only removed by atexit
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # running, as another user
+    return True
+
+
+# Spilled resumes of server processes that crashed or were killed (atexit did not run) are removed at startup
+def _remove_stale_folders(root=ARTIFACT_ROOT):
+    if not os.path.isdir(root):
+        return
+    for name in os.listdir(root):
+        if name.isdigit() and int(name) != os.getpid() and not _process_alive(int(name)):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+_remove_stale_folders()
+atexit.register(shutil.rmtree, ARTIFACT_DIR, True)
+artifact_store = ArtifactStore()
+
+
+# <------- Helpers for the pages: keep handles in st.session_state ------->
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx # id of the session running this page
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+
+# st.session_state[name] = value, but the session only keeps a handle to the shared copy (returned)
+def set_session_artifact(name, value):
+    import streamlit as st
+    handle = st.session_state[name] = artifact_store.put(_session_id(), name, value)
+    return handle
+
+
+# The value stored with set_session_artifact, or default when it is missing or its session expired
+def get_session_artifact(name, default=None):
+    import streamlit as st
+    handle = st.session_state.get(name)
+    if not handle:
+        return default
+    artifact_store.touch(_session_id())
+    value = artifact_store.get(handle)
+    return default if value is None else value
+
+
+def session_memory_report():
+    return artifact_store.session_report(_session_id())
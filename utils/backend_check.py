@@ -0,0 +1,69 @@
+import argparse # command line options
+import json # sample set is a JSONL file
+import sys # exit code for the tolerance check
+import time # throughput
+import numpy as np # score drift statistics
+from utils.embeddings import ATS_MODEL_NAME, encode_texts # shared model registry, any backend
+from utils.analysis import calculate_similarity_bert # the ATS score users see (full or chunked)
+
+
+# ATS score (0-100) of every (resume, job description) pair with one model / backend, computed by the
+# same calculate_similarity_bert as the analyzer page; returns the scores and the texts encoded per second
+def score_pairs(pairs, model_name, backend, batch_size=32):
+    encoded = [0]
+
+    # uncached, so the candidate is not answered with vectors of the baseline
+    def encode(texts):
+        texts = list(texts)
+        encoded[0] += len(texts)
+        return np.vstack([
+            encode_texts(texts[i:i + batch_size], model_name, backend=backend) for i in range(0, len(texts), batch_size)
+        ])
+
+    encode_texts(["warm up"], model_name, backend=backend)  # load + warm up outside the timing
+    start = time.perf_counter()
+    scores = np.array([float(calculate_similarity_bert(resume, job_desc, encode=encode)) for resume, job_desc in pairs])
+    elapsed = time.perf_counter() - start
+    return scores, encoded[0] / elapsed
+
+
+# Compare a faster backend / smaller model against the fp32 torch baseline on a sample set
+def check_backend(pairs, backend, model_name=None, baseline_model=None):
+    baseline_model = baseline_model or ATS_MODEL_NAME
+    model_name = model_name or baseline_model
+    baseline_scores, baseline_rate = score_pairs(pairs, baseline_model, "torch")
+    scores, rate = score_pairs(pairs, model_name, backend)
+    drift = np.abs(scores - baseline_scores)
+    return {
+        "pairs": len(pairs),
+        "baseline": f"{baseline_model} (torch)",
+        "candidate": f"{model_name} ({backend})",
+        "mean_drift": float(drift.mean()),
+        "max_drift": float(drift.max()),
+        "baseline_texts_per_sec": baseline_rate,
+        "candidate_texts_per_sec": rate,
+        "speedup": rate / baseline_rate,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check ATS score drift and speed of an embedding backend.")
+    parser.add_argument("samples", help='JSONL file with {"resume": ..., "job_desc": ...} per line')
+    parser.add_argument("--backend", default="onnx-int8", choices=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--model", default=None, help="candidate model, e.g. a smaller distilled model")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="max allowed ATS score drift (points)")
+    args = parser.parse_args(argv)
+
+    with open(args.samples, encoding="utf-8") as f:
+        pairs = [(row["resume"], row["job_desc"]) for row in map(json.loads, filter(str.strip, f))]
+
+    result = check_backend(pairs, args.backend, args.model)
+    print(json.dumps(result, indent=2))
+    if result["max_drift"] > args.tolerance:
+        print(f"❌ max drift {result['max_drift']:.2f} is above the tolerance of {args.tolerance}")
+        sys.exit(1)
+    print(f"✅ max drift {result['max_drift']:.2f} is within the tolerance of {args.tolerance}")
+
+
+if __name__ == "__main__":
+    main()
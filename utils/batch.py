@@ -0,0 +1,222 @@
+import argparse # command line options
+import csv # results are written row by row so a stopped run can continue
+import os # walk folders and build paths
+import time # throughput (resumes / sec)
+import zipfile # resumes can come as a ZIP file
+from concurrent.futures import ProcessPoolExecutor # extract PDFs on all CPU cores
+import multiprocessing # workers are started with "spawn", never forked from the server (threads, model, sockets)
+from utils.embeddings import encode_texts, normalize_text # shared model, one batched encode per chunk
+from utils.analysis import ats_scores # same ATS score as the analyzer page
+from utils.pdf_text import extract_text_from_pdf # extract text from pdf
+from utils.report import get_report # Groq analysis report, only used for the top ranked resumes
+from utils.report_parser import ReportParser # scores + missing skills from the report
+from utils.skills import get_matcher, find_missing_skills # local skill matcher, runs inside the workers too
+
+BATCH_SIZE = 256 # resumes extracted and encoded together
+RESULT_FIELDS = ["file", "ats_score", "characters", "missing_skills", "error"]
+
+
+# Find all PDF files in a folder (including sub folders) or inside a ZIP file
+# returns a list of (name, location), location is a path or (zip path, member name)
+def list_resumes(source):
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            members = sorted(
+                name for name in archive.namelist()
+                if name.lower().endswith(".pdf") and not name.startswith("__MACOSX/")
+            )
+        return [(name, (source, name)) for name in members]
+
+    items = []
+    for folder, _, files in os.walk(source):
+        for file_name in files:
+            if file_name.lower().endswith(".pdf"):
+                path = os.path.join(folder, file_name)
+                items.append((os.path.relpath(path, source), path))
+    return sorted(items)
+
+
+# archive: the ZIP file already opened, so its member list is not read again for every resume
+def read_resume_text(location, archive=None):
+    if isinstance(location, tuple):
+        if archive is None:
+            with zipfile.ZipFile(location[0]) as archive:
+                return extract_text_from_pdf(archive.read(location[1]))
+        return extract_text_from_pdf(archive.read(location[1]))
+    return extract_text_from_pdf(location)
+
+
+# the ZIP file being screened, opened once in every worker process
+_worker_archive = None
+
+
+def _init_worker(source):
+    global _worker_archive
+    if zipfile.is_zipfile(source):
+        _worker_archive = zipfile.ZipFile(source)
+
+
+# runs inside the process pool, errors are returned instead of raised so one bad PDF does not stop the batch
+# returns (name, text, error, skills found in the resume)
+def _extract_one(item):
+    name, location = item
+    try:
+        text = read_resume_text(location, _worker_archive).strip()
+        return name, text, "", get_matcher().find(text)
+    except Exception as e:
+        return name, "", str(e), {}
+
+
+# the model without the embedding cache: every resume is seen once, caching them would only push out useful entries
+def _encode_uncached(texts):
+    return encode_texts([normalize_text(text) for text in texts])
+
+
+# results files written before a column was added have an older header: rewrite them with the
+# current columns (new columns stay empty for those rows) so the rows appended now line up
+def _upgrade_results(output):
+    if not os.path.exists(output) or os.path.getsize(output) == 0:
+        return
+    with open(output, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames == RESULT_FIELDS:
+            return
+        rows = list(reader)
+    with open(output + ".tmp", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, restval="", extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(output + ".tmp", output)
+
+
+# names already written to the results file by an earlier (stopped) run
+def _read_done(output):
+    if not os.path.exists(output):
+        return set()
+    with open(output, newline="", encoding="utf-8") as f:
+        return {row["file"] for row in csv.DictReader(f)}
+
+
+# Score every resume in source against one job description and append the rows to the output CSV.
+# Files already in the output are skipped, so running it again continues where it stopped.
+# progress(done, total, resumes_per_sec) is called after every batch.
+def screen_resumes(source, job_desc, output, batch_size=BATCH_SIZE, workers=None, progress=None):
+    items = list_resumes(source)
+    _upgrade_results(output)
+    done = _read_done(output)
+    todo = [item for item in items if item[0] not in done]
+    workers = workers or os.cpu_count() or 1
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+
+    jd_skills = get_matcher().find(job_desc)
+    write_header = not os.path.exists(output) or os.path.getsize(output) == 0
+    processed = 0
+    start = time.perf_counter()
+
+    with open(output, "a", newline="", encoding="utf-8") as f, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(source,), mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if write_header:
+            writer.writeheader()
+
+        chunksize = max(1, batch_size // (workers * 4))
+        pending = pool.map(_extract_one, batches[0], chunksize=chunksize) if batches else None
+        for index in range(len(batches)):
+            extracted = list(pending)
+            # the pool already extracts the next batch while this one is encoded
+            if index + 1 < len(batches):
+                pending = pool.map(_extract_one, batches[index + 1], chunksize=chunksize)
+
+            texts = [text for _, text, _, _ in extracted if text]
+            scores = iter(ats_scores(texts, job_desc, encode=_encode_uncached)) if texts else iter(())
+            for name, text, error, resume_skills in extracted:
+                missing = find_missing_skills(text, job_desc, False, resume_skills, jd_skills) if text else []
+                writer.writerow({
+                    "file": name,
+                    "ats_score": f"{next(scores):.2f}" if text else "",
+                    "characters": len(text),
+                    "missing_skills": "; ".join(missing),
+                    "error": error or ("" if text else "no text found in PDF"),
+                })
+            f.flush()
+
+            processed += len(extracted)
+            if progress:
+                progress(processed, len(todo), processed / (time.perf_counter() - start))
+
+    elapsed = time.perf_counter() - start
+    return {
+        "total": len(items),
+        "skipped": len(items) - len(todo),
+        "processed": processed,
+        "seconds": elapsed,
+        "resumes_per_sec": processed / elapsed if elapsed else 0.0,
+    }
+
+
+# Sort the results file by ATS score, optionally add the Groq report for the top K resumes,
+# and write the ranking to ranked_output (.csv or .parquet)
+def rank_results(output, ranked_output, source=None, job_desc=None, top_k_reports=0):
+    import pandas as pd # write the final ranking as CSV or Parquet (only needed here)
+    ranking = pd.read_csv(output, keep_default_na=False)
+    ranking["ats_score"] = pd.to_numeric(ranking["ats_score"], errors="coerce")
+    ranking = ranking.sort_values("ats_score", ascending=False, na_position="last").reset_index(drop=True)
+    ranking.insert(0, "rank", range(1, len(ranking) + 1))
+
+    if top_k_reports and source and job_desc:
+        locations = dict(list_resumes(source))
+        ranking["ai_score"] = ""
+        ranking["ai_missing_skills"] = ""
+        ranking["report"] = ""
+        archive = zipfile.ZipFile(source) if zipfile.is_zipfile(source) else None
+        try:
+            for index in ranking.index[:top_k_reports]:
+                if ranking.at[index, "error"]:
+                    continue
+                report = get_report(read_resume_text(locations[ranking.at[index, "file"]], archive), job_desc)
+                parser = ReportParser()
+                parser.feed(report)
+                parser.finish()
+                ranking.at[index, "ai_score"] = f"{parser.average_score():.2f}"
+                ranking.at[index, "ai_missing_skills"] = "; ".join(parser.missing_skills)
+                ranking.at[index, "report"] = report
+        finally:
+            if archive is not None:
+                archive.close()
+
+    if ranked_output.lower().endswith(".parquet"):
+        ranking.to_parquet(ranked_output, index=False)
+    else:
+        ranking.to_csv(ranked_output, index=False)
+    return ranking
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a folder or ZIP of resume PDFs against one job description.")
+    parser.add_argument("resumes", help="folder or ZIP file with resume PDFs")
+    parser.add_argument("--jd", required=True, help="text file with the job description")
+    parser.add_argument("--out", default="screening_results.csv", help="results CSV, written while running (resumable)")
+    parser.add_argument("--ranked", default="screening_ranked.csv", help="final ranking, .csv or .parquet")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes (default: all cores)")
+    parser.add_argument("--top-k-reports", type=int, default=0, help="generate the AI report for the top K resumes")
+    args = parser.parse_args(argv)
+
+    with open(args.jd, encoding="utf-8") as f:
+        job_desc = f.read()
+
+    def show_progress(done, total, rate):
+        print(f"{done}/{total} resumes, {rate:.1f} resumes/sec", flush=True)
+
+    stats = screen_resumes(args.resumes, job_desc, args.out, args.batch_size, args.workers, show_progress)
+    print(
+        f"Screened {stats['processed']} resumes ({stats['skipped']} already done) "
+        f"in {stats['seconds']:.1f}s, {stats['resumes_per_sec']:.1f} resumes/sec"
+    )
+    rank_results(args.out, args.ranked, args.resumes, job_desc, args.top_k_reports)
+    print(f"Ranking written to {args.ranked}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os # build the cache folder path
+import atexit # write the last used times of recent hits when the server stops
+import sqlite3 # on-disk cache that survives server restarts
+import threading # locks so sessions can use the caches at the same time
+import time # last used time for eviction
+from collections import OrderedDict # keeps items in least-recently-used order
+from dotenv import load_dotenv # extract settings from .env file
+
+load_dotenv()
+
+# Folder where all on-disk caches are kept
+CACHE_DIR = os.getenv("SKILLGAP_CACHE_DIR", ".cache")
+SQLITE_RECOUNT_SETS = 100  # count the size of a disk cache again after this many sets
+SQLITE_TOUCH_INTERVAL = 5  # seconds between writes of the last used times of disk cache hits
+
+
+# In-memory LRU cache that evicts the least recently used items once max_size is reached
+# (size is whatever the caller passes to set(), e.g. bytes, or 1 per item to limit the item count)
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.total_size = 0
+        self._items = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def set(self, key, value, size):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_size -= old[1]
+            self._items[key] = (value, size)
+            self.total_size += size
+            # drop the oldest items until we fit again
+            while self.total_size > self.max_size and len(self._items) > 1:
+                _, (_, old_size) = self._items.popitem(last=False)
+                self.total_size -= old_size
+
+    def delete(self, key):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_size -= old[1]
+
+    def __len__(self):
+        return len(self._items)
+
+
+# Key/value store of bytes kept in a SQLite file, evicts least recently used rows once max_bytes is reached
+# The total size is kept in memory and only counted again from the table every SQLITE_RECOUNT_SETS sets (other
+# server processes write to the same file) or when it looks full. Hits only update last_used in memory, the
+# times are written together every SQLITE_TOUCH_INTERVAL seconds (and before evicting).
+class SQLiteStore:
+    def __init__(self, name, max_bytes):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self.path = os.path.join(CACHE_DIR, f"{name}.sqlite3")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # lets several server processes read while one writes
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB, size INTEGER, created REAL, last_used REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)")  # eviction order
+        self._conn.commit()
+        self._total = self._count_bytes()
+        self._sets = 0  # sets since the total was last counted
+        self._touched = {}  # key -> last used time of hits not written yet
+        self._last_touch_write = time.time()
+        atexit.register(self._write_touches_locked)
+
+    # Returns (value, created time) or None
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._touched[key] = now
+            if now - self._last_touch_write >= SQLITE_TOUCH_INTERVAL:
+                self._write_touches()
+                self._conn.commit()
+            return row[0], row[1]
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._touched.pop(key, None)
+            self._total += len(value) - (old[0] if old else 0)
+            self._sets += 1
+            if self._sets >= SQLITE_RECOUNT_SETS:
+                self._total = self._count_bytes()
+            if self._total > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+            self._touched.pop(key, None)
+            if old:
+                self._total -= old[0]
+
+    def _count_bytes(self):
+        self._sets = 0
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    # write the last used times of the hits since the last write (called with the lock held, commit is up to the caller)
+    def _write_touches(self):
+        if self._touched:
+            self._conn.executemany("UPDATE cache SET last_used = ? WHERE key = ?", [(t, k) for k, t in self._touched.items()])
+            self._touched.clear()
+        self._last_touch_write = time.time()
+
+    def _write_touches_locked(self):
+        with self._lock:
+            try:
+                self._write_touches()
+                self._conn.commit()
+            except sqlite3.Error:
+                pass  # the server is stopping, losing some last used times only changes what is evicted first
+
+    # delete the least recently used rows until the file content fits in max_bytes
+    def _evict(self):
+        self._write_touches()
+        total = self._count_bytes()  # also counts what other processes added
+        while total > self.max_bytes:
+            rows = self._conn.execute("SELECT key, size FROM cache ORDER BY last_used LIMIT 100").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                total -= size
+        self._total = total
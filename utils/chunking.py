@@ -0,0 +1,95 @@
+import os # read the chunking settings from the environment
+import re # split text into paragraphs and sentences
+import numpy as np # chunk by chunk similarity matrix
+from dotenv import load_dotenv # extract settings from .env file
+from utils.embeddings import encode_texts_cached, normalize_rows # shared model, chunks seen before come from the cache
+
+load_dotenv()
+
+# The model only reads about the first 384 tokens of a text, so long documents are scored in windows
+CHUNK_WORDS = int(os.getenv("ATS_CHUNK_WORDS", "200"))  # ~200 words stays under the model limit
+CHUNK_POOLING = os.getenv("ATS_CHUNK_POOLING", "max-mean")  # "max-mean" or "top-k-mean"
+CHUNK_TOP_K = int(os.getenv("ATS_CHUNK_TOP_K", "3"))  # resume chunks averaged per JD chunk for "top-k-mean"
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+# Split a document into windows of at most max_words words.
+# Paragraphs / lines are kept together where possible, long ones are split by sentences and then by words.
+def split_into_chunks(text, max_words=CHUNK_WORDS):
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n|\n", text):
+        words = paragraph.split()
+        if not words:
+            continue
+        if len(words) <= max_words:
+            pieces.append(words)
+            continue
+        for sentence in SENTENCE_END.split(paragraph):
+            sentence_words = sentence.split()
+            for start in range(0, len(sentence_words), max_words):
+                pieces.append(sentence_words[start:start + max_words])
+
+    # merge small pieces (e.g. single lines of a resume) into windows
+    chunks, current = [], []
+    for words in pieces:
+        if current and len(current) + len(words) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+        current.extend(words)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+# Split on blank lines first so an edit in one section only changes that section's chunks
+# (used for every chunked score, so the live score can re-embed only the sections that were edited)
+def split_into_sections(text, max_words=CHUNK_WORDS):
+    chunks = []
+    for section in re.split(r"\n\s*\n", text):
+        chunks.extend(split_into_chunks(section, max_words))
+    return chunks
+
+
+# Reduce the (resume chunks x JD chunks) matrix to one score between 0 and 1
+# every JD chunk is a requirement: take how well the resume covers it, then average over the requirements
+def pool_similarity(matrix, pooling=CHUNK_POOLING, top_k=CHUNK_TOP_K):
+    if pooling == "max-mean":
+        per_requirement = matrix.max(axis=0)
+    elif pooling == "top-k-mean":
+        k = min(top_k, matrix.shape[0])
+        per_requirement = np.sort(matrix, axis=0)[-k:].mean(axis=0)
+    else:
+        raise ValueError(f"Unknown chunk pooling: {pooling}")
+    return float(per_requirement.mean())
+
+
+# Score a resume against a job description chunk by chunk.
+# All chunks of both documents are encoded in one batch; returns the score (0-100) and the alignment:
+# {"resume_chunks": [...], "jd_chunks": [...], "matrix": array of shape (resume chunks, JD chunks)}
+# encode can be swapped, e.g. for a micro-batcher that encodes concurrent requests together
+def chunked_similarity(resume, job_desc, pooling=CHUNK_POOLING, top_k=CHUNK_TOP_K, max_words=CHUNK_WORDS, encode=encode_texts_cached):
+    resume_chunks = split_into_sections(resume, max_words) or [""]
+    jd_chunks = split_into_sections(job_desc, max_words) or [""]
+
+    embeddings = normalize_rows(encode(resume_chunks + jd_chunks))
+    matrix = embeddings[:len(resume_chunks)] @ embeddings[len(resume_chunks):].T
+
+    score = pool_similarity(matrix, pooling, top_k) * 100
+    return score, {"resume_chunks": resume_chunks, "jd_chunks": jd_chunks, "matrix": matrix}
+
+
+# chunked_similarity scores of many resumes against one job description, all chunks encoded in one batch
+def chunked_scores(resumes, job_desc, pooling=CHUNK_POOLING, top_k=CHUNK_TOP_K, max_words=CHUNK_WORDS, encode=encode_texts_cached):
+    resume_chunks = [split_into_sections(resume, max_words) or [""] for resume in resumes]
+    jd_chunks = split_into_sections(job_desc, max_words) or [""]
+    all_chunks = [chunk for chunks in resume_chunks for chunk in chunks]
+
+    embeddings = normalize_rows(encode(all_chunks + jd_chunks))
+    jd_vectors = embeddings[len(all_chunks):]
+    scores, start = [], 0
+    for chunks in resume_chunks:
+        matrix = embeddings[start:start + len(chunks)] @ jd_vectors.T
+        scores.append(pool_similarity(matrix, pooling, top_k) * 100)
+        start += len(chunks)
+    return scores
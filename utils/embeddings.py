@@ -0,0 +1,175 @@
+import os # read model name / device from the environment
+import hashlib # content hash used as the cache key
+import threading # lock so only one worker loads the model at a time
+import numpy as np # embeddings are stored as float32 arrays
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import CACHE_DIR, LRUCache, SQLiteStore # memory and disk cache tiers
+from utils.telemetry import stage, count # model load / embedding timings and cache hit counters
+
+load_dotenv()
+
+# Model settings, can be changed from the .env file
+ATS_MODEL_NAME = os.getenv("ATS_MODEL_NAME", "sentence-transformers/all-mpnet-base-v2")
+ATS_MODEL_DEVICE = os.getenv("ATS_MODEL_DEVICE") or None  # None lets sentence-transformers pick cpu / cuda
+# Inference backend: "torch" (fp32), "onnx" (ONNX Runtime fp32) or "onnx-int8" (ONNX Runtime, dynamic int8 quantization)
+ATS_MODEL_BACKEND = os.getenv("ATS_MODEL_BACKEND", "torch")
+# CPU instruction set the int8 model is quantized for: "avx512_vnni", "avx512", "avx2" or "arm64"
+ATS_ONNX_QUANTIZATION = os.getenv("ATS_ONNX_QUANTIZATION", "avx512_vnni")
+
+# file names sentence-transformers uses for the quantized models
+QUANTIZED_FILES = {
+    "avx512_vnni": "onnx/model_qint8_avx512_vnni.onnx",
+    "avx512": "onnx/model_qint8_avx512.onnx",
+    "avx2": "onnx/model_quint8_avx2.onnx",
+    "arm64": "onnx/model_qint8_arm64.onnx",
+}
+
+# Embedding cache sizes in MB (memory tier per process, disk tier shared by all processes)
+EMBED_CACHE_MEMORY_MB = int(os.getenv("EMBED_CACHE_MEMORY_MB", "64"))
+EMBED_CACHE_DISK_MB = int(os.getenv("EMBED_CACHE_DISK_MB", "512"))
+
+# Process wide registry: every Streamlit session and rerun in this server process shares these models
+_models = {}
+_models_lock = threading.Lock()
+# the fast tokenizer inside the model is not thread safe ("Already borrowed"), so encode calls take turns
+_encode_locks = {}
+
+
+# sentence-transformers (and torch) are only imported here, so opening a page does not wait for them
+def _load_model(model_name, device, backend):
+    from sentence_transformers import SentenceTransformer # generate Embeddings of text like vector A, vector B
+
+    if backend == "torch":
+        return SentenceTransformer(model_name, device=device)
+    if backend == "onnx":
+        return SentenceTransformer(model_name, device=device, backend="onnx")
+    if backend != "onnx-int8":
+        raise ValueError(f"Unknown ATS_MODEL_BACKEND: {backend}")
+
+    file_name = QUANTIZED_FILES[ATS_ONNX_QUANTIZATION]
+    try:
+        # most sentence-transformers models on the hub already ship the quantized files
+        return SentenceTransformer(model_name, device=device, backend="onnx", model_kwargs={"file_name": file_name})
+    except Exception:
+        # otherwise quantize it once and keep it in the cache folder
+        from sentence_transformers import export_dynamic_quantized_onnx_model # int8 version of the model for fast CPU inference
+        local_path = os.path.join(CACHE_DIR, "onnx", model_name.replace("/", "__"))
+        if not os.path.exists(os.path.join(local_path, file_name)):
+            model = SentenceTransformer(model_name, device=device, backend="onnx")
+            model.save(local_path)
+            export_dynamic_quantized_onnx_model(model, ATS_ONNX_QUANTIZATION, local_path)
+        return SentenceTransformer(local_path, device=device, backend="onnx", model_kwargs={"file_name": file_name})
+
+
+def _model_key(model_name, device, backend):
+    return (model_name or ATS_MODEL_NAME, device or ATS_MODEL_DEVICE, backend or ATS_MODEL_BACKEND)
+
+
+# Returns the loaded model, loading it only the first time it is asked for
+def get_model(model_name=None, device=None, backend=None):
+    key = _model_key(model_name, device, backend)
+
+    model = _models.get(key)
+    if model is None:
+        with _models_lock:
+            # check again, another session may have loaded it while we were waiting
+            model = _models.get(key)
+            if model is None:
+                with stage("model_load", model=key[0], backend=key[2]):
+                    model = _load_model(*key)
+                _encode_locks[key] = threading.Lock()
+                _models[key] = model
+    return model
+
+
+# Encode a list of texts in a single batched call
+def encode_texts(texts, model_name=None, device=None, backend=None):
+    model = get_model(model_name, device, backend)
+    texts = list(texts)
+    with _encode_locks[_model_key(model_name, device, backend)], stage("embed", texts=len(texts)):
+        return model.encode(texts)
+
+
+# <------- Embedding Cache ------->
+
+_memory_cache = LRUCache(EMBED_CACHE_MEMORY_MB * 1024 * 1024)
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+
+
+def _get_disk_cache():
+    global _disk_cache
+    if _disk_cache is None:
+        with _disk_cache_lock:
+            if _disk_cache is None:
+                _disk_cache = SQLiteStore("embeddings", EMBED_CACHE_DISK_MB * 1024 * 1024)
+    return _disk_cache
+
+
+# same text with different spacing should give the same cache entry
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+def embedding_key(text, model_name=None):
+    model_name = model_name or ATS_MODEL_NAME
+    # vectors from the ONNX backends differ slightly, so they get their own cache entries
+    if ATS_MODEL_BACKEND != "torch":
+        model_name = f"{model_name}:{ATS_MODEL_BACKEND}"
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+# Same as encode_texts but looks every text up in the memory cache, then the disk cache,
+# and only sends the missing ones to the model (in one batch)
+def encode_texts_cached(texts, model_name=None, device=None):
+    texts = [normalize_text(text) for text in texts]
+    keys = [embedding_key(text, model_name) for text in texts]
+    disk_cache = _get_disk_cache()
+
+    vectors = [None] * len(texts)
+    missing = []
+    for i, key in enumerate(keys):
+        vector = _memory_cache.get(key)
+        if vector is None:
+            row = disk_cache.get(key)
+            if row is not None:
+                vector = np.frombuffer(row[0], dtype=np.float32)
+                _memory_cache.set(key, vector, vector.nbytes)
+        if vector is None:
+            missing.append(i)
+        vectors[i] = vector
+
+    count("embedding_cache_hits", len(texts) - len(missing))
+    count("embedding_cache_misses", len(missing))
+    if missing:
+        # encode each distinct missing text only once
+        unique = list(dict.fromkeys(texts[i] for i in missing))
+        encoded = encode_texts(unique, model_name, device)
+        new_vectors = {}
+        for text, vector in zip(unique, encoded):
+            vector = np.asarray(vector, dtype=np.float32)
+            key = embedding_key(text, model_name)
+            _memory_cache.set(key, vector, vector.nbytes)
+            disk_cache.set(key, vector.tobytes())
+            new_vectors[text] = vector
+        for i in missing:
+            vectors[i] = new_vectors[texts[i]]
+
+    return np.vstack(vectors)
+
+
+# Scale every row to length 1, so a dot product is the cosine similarity
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+# Cosine similarity (0-100) of every row of matrix against one vector, in a single matrix-vector product
+def cosine_scores(matrix, vector):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+    norms[norms == 0] = 1.0
+    return (matrix @ vector) / norms * 100
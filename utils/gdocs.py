@@ -0,0 +1,149 @@
+import os # read the export settings from the environment
+import io # resume text uploaded from memory
+import hashlib # the same resume is only exported once per user and folder
+import random # jitter between create retries
+import time # backoff between create retries
+import threading # one Drive client per bulk export thread
+from concurrent.futures import ThreadPoolExecutor, as_completed # export many resumes at the same time
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import SQLiteStore # exported document ids survive server restarts
+from utils.llm import TokenBucket # keep bulk exports within the Drive write quota
+from utils.telemetry import stage, count # export timings and API call counts
+
+load_dotenv()
+
+# Settings, can be changed from the .env file
+GDOCS_WRITES_PER_MINUTE = int(os.getenv("GDOCS_WRITES_PER_MINUTE", "120"))  # Drive allows a few writes per second per user
+GDOCS_WORKERS = int(os.getenv("GDOCS_WORKERS", "4"))  # exports running at the same time in bulk mode
+GDOCS_RETRIES = int(os.getenv("GDOCS_RETRIES", "5"))  # retries with backoff on 429 / 5xx answers
+DOC_MIME_TYPE = "application/vnd.google-apps.document"  # Drive converts the uploaded text into a Google Doc
+EXPORT_PROPERTY = "skillgapExport"  # appProperties key on every exported file: hash of user, folder and resume
+
+_write_bucket = TokenBucket(GDOCS_WRITES_PER_MINUTE)
+_store = None
+_store_lock = threading.Lock()
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SQLiteStore("gdocs", 8 * 1024 * 1024)
+    return _store
+
+
+# Drive client for these credentials (build once and keep it, e.g. in the session)
+def build_drive(credentials):
+    from googleapiclient.discovery import build # Google API client, imported on first use
+    return build("drive", "v3", credentials=credentials, cache_discovery=False)
+
+
+def doc_url(doc_id):
+    return f"https://docs.google.com/document/d/{doc_id}/edit"
+
+
+# Stable id of the signed in Google user, used to keep one document per user and resume
+def get_user_id(drive):
+    count("google_api_calls")
+    about = drive.about().get(fields="user(permissionId,emailAddress)").execute(num_retries=GDOCS_RETRIES)
+    return about["user"].get("permissionId") or about["user"].get("emailAddress")
+
+
+def _memo_key(user, text, folder):
+    return f"{user}:{folder or 'root'}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+def _export_id(memo_key):
+    return hashlib.sha256(memo_key.encode("utf-8")).hexdigest()
+
+
+# 429, 5xx, timeouts and dropped connections may succeed when tried again
+def _retryable(error):
+    from googleapiclient.errors import HttpError
+    if isinstance(error, HttpError):
+        return error.resp.status == 429 or error.resp.status >= 500
+    return isinstance(error, (TimeoutError, ConnectionError, OSError))
+
+
+# The document an earlier create made for this export, when Drive created it but the answer was lost
+def _find_export(drive, export_id):
+    count("google_api_calls")
+    query = f"appProperties has {{ key='{EXPORT_PROPERTY}' and value='{export_id}' }} and trashed = false"
+    files = drive.files().list(q=query, spaces="drive", fields="files(id)", pageSize=1).execute(num_retries=GDOCS_RETRIES)
+    return files["files"][0]["id"] if files.get("files") else None
+
+
+def _doc_exists(drive, doc_id):
+    from googleapiclient.errors import HttpError
+    try:
+        count("google_api_calls")
+        file = drive.files().get(fileId=doc_id, fields="id,trashed").execute(num_retries=GDOCS_RETRIES)
+    except HttpError as e:
+        if e.resp.status == 404:
+            return False
+        raise
+    return not file.get("trashed", False)
+
+
+# One round-trip: Drive creates the Google Doc with the text already in it, directly inside folder.
+# A create is not idempotent, so the client library never retries it: after an error that may have happened
+# after Drive created the file, the file is looked up by its export_id before trying again.
+def create_doc(drive, text, title, folder=None, export_id=None):
+    from googleapiclient.http import MediaIoBaseUpload
+    body = {"name": title, "mimeType": DOC_MIME_TYPE}
+    if folder:
+        body["parents"] = [folder]
+    if export_id:
+        body["appProperties"] = {EXPORT_PROPERTY: export_id}
+    for attempt in range(GDOCS_RETRIES + 1):
+        media = MediaIoBaseUpload(io.BytesIO(text.encode("utf-8")), mimetype="text/plain", resumable=False)
+        _write_bucket.acquire(1)
+        try:
+            with stage("docs_create"):
+                count("google_api_calls")
+                return drive.files().create(body=body, media_body=media, fields="id").execute(num_retries=0)["id"]
+        except Exception as e:
+            if attempt == GDOCS_RETRIES or not _retryable(e):
+                raise
+        if export_id:
+            doc_id = _find_export(drive, export_id)
+            if doc_id is not None:
+                return doc_id
+        time.sleep(min(2 ** attempt, 30) + random.random())
+
+
+# Export a resume as a Google Doc, returns (document id, created).
+# The same resume exported again by the same user (to the same folder) returns the existing document,
+# unless it was deleted or moved to the trash.
+def export_resume(drive, user, text, title="AI Editable Resume", folder=None):
+    store = _get_store()
+    key = _memo_key(user, text, folder)
+    row = store.get(key)
+    if row is not None:
+        doc_id = row[0].decode("utf-8")
+        if _doc_exists(drive, doc_id):
+            return doc_id, False
+    doc_id = create_doc(drive, text, title, folder, _export_id(key))
+    store.set(key, doc_id.encode("utf-8"))
+    return doc_id, True
+
+
+# Bulk mode: export many resumes ({title: text}) at the same time, within GDOCS_WRITES_PER_MINUTE.
+# Yields (title, {"doc_id", "created", "error"}) as each export finishes, so the caller can show progress.
+def export_resumes(credentials, user, resumes, folder=None, workers=GDOCS_WORKERS):
+    local = threading.local()  # the HTTP connection of a Drive client is not thread safe
+
+    def export_one(title):
+        if not hasattr(local, "drive"):
+            local.drive = build_drive(credentials)
+        try:
+            doc_id, created = export_resume(local.drive, user, resumes[title], title, folder)
+            return {"doc_id": doc_id, "created": created, "error": None}
+        except Exception as e:
+            return {"doc_id": None, "created": False, "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(export_one, title): title for title in resumes}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -0,0 +1,278 @@
+import argparse # command line options
+import csv # job corpus can be a CSV file
+import hashlib # id for postings that do not have one
+import json # index settings and the postings log
+import os # paths and file sizes
+import threading # one index per process, shared by all sessions
+import numpy as np # vectors are a normalized float32 matrix
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import CACHE_DIR # the index lives next to the other caches by default
+from utils.embeddings import ATS_MODEL_NAME, encode_texts, encode_texts_cached, normalize_rows # same model as the ATS score
+from utils.pdf_text import extract_text_from_pdf # resume PDFs for the command line search
+
+load_dotenv()
+
+JOB_INDEX_DIR = os.getenv("JOB_INDEX_DIR", os.path.join(CACHE_DIR, "job_index"))
+JOB_INDEX_ANN = os.getenv("JOB_INDEX_ANN", "0") == "1"  # use hnswlib (if installed) for very large libraries
+ADD_BATCH_SIZE = 512 # postings encoded together while adding
+
+try:
+    import hnswlib # optional approximate nearest neighbour search
+except ImportError:
+    hnswlib = None
+
+
+# Read job postings from a JSONL or CSV file, every posting needs a "description" (or "text") field
+def load_jobs(path):
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    jobs = []
+    for row in rows:
+        text = row.get("description") or row.get("text") or ""
+        if not text.strip():
+            continue
+        job_id = str(row.get("id") or hashlib.sha256(text.encode("utf-8")).hexdigest()[:16])
+        jobs.append({
+            "id": job_id,
+            "title": row.get("title", ""),
+            "company": row.get("company", ""),
+            "url": row.get("url", ""),
+            "text": text,
+        })
+    return jobs
+
+
+# Job description library stored on disk:
+#   index.json     model name and vector size
+#   vectors.f32    one normalized float32 row per posting, memory mapped when loaded, only ever appended to
+#   postings.jsonl log of "add" / "remove" operations, removed rows are skipped until compact() rewrites the files
+class JobIndex:
+    def __init__(self, folder=JOB_INDEX_DIR, model_name=None):
+        self.folder = folder
+        self.model_name = model_name or ATS_MODEL_NAME
+        self.dim = None
+        self.vectors = None
+        self.postings = {}  # row -> posting info (without the text)
+        self.rows_by_id = {}  # posting id -> row
+        self.row_count = 0
+        self.removed_rows = np.zeros(0, dtype=np.int64)  # rows still in vectors.f32 but no longer searchable
+        self.ann = None
+        self._lock = threading.RLock()
+        self._loaded_mtime = None
+        os.makedirs(folder, exist_ok=True)
+        self.load()
+
+    def _path(self, name):
+        return os.path.join(self.folder, name)
+
+    def _log_mtime(self):
+        path = self._path("postings.jsonl")
+        return os.path.getmtime(path) if os.path.exists(path) else None
+
+    # (re)load the index from disk
+    def load(self):
+        with self._lock:
+            settings_path = self._path("index.json")
+            if os.path.exists(settings_path):
+                with open(settings_path, encoding="utf-8") as f:
+                    settings = json.load(f)
+                if settings["model"] != self.model_name:
+                    raise ValueError(
+                        f"Job index was built with {settings['model']} but the ATS model is {self.model_name}, "
+                        "rebuild the index."
+                    )
+                self.dim = settings["dim"]
+
+            self.postings, self.rows_by_id, self.row_count = {}, {}, 0
+            if os.path.exists(self._path("postings.jsonl")):
+                with open(self._path("postings.jsonl"), encoding="utf-8") as f:
+                    for line in f:
+                        op = json.loads(line)
+                        if op["op"] == "add":
+                            self.postings[op["row"]] = op
+                            self.rows_by_id[op["id"]] = op["row"]
+                            self.row_count = max(self.row_count, op["row"] + 1)
+                        elif op["op"] == "remove" and op["id"] in self.rows_by_id:
+                            del self.postings[self.rows_by_id.pop(op["id"])]
+
+            self.removed_rows = np.setdiff1d(np.arange(self.row_count), np.fromiter(self.postings, dtype=np.int64))
+            self.vectors = None
+            if self.row_count:
+                self.vectors = np.memmap(
+                    self._path("vectors.f32"), dtype=np.float32, mode="r", shape=(self.row_count, self.dim)
+                )
+            self._loaded_mtime = self._log_mtime()
+            self._load_ann()
+
+    # pick up changes made by another process (e.g. the command line tool)
+    def refresh(self):
+        if self._log_mtime() != self._loaded_mtime:
+            self.load()
+
+    def __len__(self):
+        return len(self.postings)
+
+    # Add (or replace) postings, only the new postings are encoded
+    def add(self, jobs):
+        with self._lock:
+            replaced = [job["id"] for job in jobs if job["id"] in self.rows_by_id]
+            if replaced:
+                self.remove(replaced)
+
+            log = []
+            for start in range(0, len(jobs), ADD_BATCH_SIZE):
+                batch = jobs[start:start + ADD_BATCH_SIZE]
+                vectors = normalize_rows(encode_texts([job["text"] for job in batch], self.model_name))
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                    with open(self._path("index.json"), "w", encoding="utf-8") as f:
+                        json.dump({"model": self.model_name, "dim": self.dim}, f)
+                with open(self._path("vectors.f32"), "ab") as f:
+                    f.write(vectors.tobytes())
+                for job in batch:
+                    info = {key: job.get(key, "") for key in ("id", "title", "company", "url")}
+                    info.update(op="add", row=self.row_count, snippet=job["text"][:300])
+                    log.append(info)
+                    self.row_count += 1
+
+            self._append_log(log)
+            self.load()
+
+    def remove(self, job_ids):
+        with self._lock:
+            log = [{"op": "remove", "id": job_id} for job_id in job_ids if job_id in self.rows_by_id]
+            self._append_log(log)
+            self.load()
+            return len(log)
+
+    def _append_log(self, operations):
+        with open(self._path("postings.jsonl"), "a", encoding="utf-8") as f:
+            for operation in operations:
+                f.write(json.dumps(operation) + "\n")
+
+    # rewrite the files without the removed rows
+    def compact(self):
+        with self._lock:
+            rows = sorted(self.postings)
+            vectors = np.array(self.vectors[rows]) if rows else np.zeros((0, self.dim or 0), dtype=np.float32)
+            operations = []
+            for new_row, old_row in enumerate(rows):
+                info = dict(self.postings[old_row])
+                info["row"] = new_row
+                operations.append(info)
+            self.vectors = None  # release the memory map before the file is replaced
+            with open(self._path("vectors.f32.tmp"), "wb") as f:
+                f.write(vectors.tobytes())
+            with open(self._path("postings.jsonl.tmp"), "w", encoding="utf-8") as f:
+                for operation in operations:
+                    f.write(json.dumps(operation) + "\n")
+            os.replace(self._path("vectors.f32.tmp"), self._path("vectors.f32"))
+            os.replace(self._path("postings.jsonl.tmp"), self._path("postings.jsonl"))
+            if os.path.exists(self._path("ann.bin")):
+                os.remove(self._path("ann.bin"))
+            self.load()
+
+    # <------- Optional ANN index ------->
+
+    def _load_ann(self):
+        self.ann = None
+        if not (JOB_INDEX_ANN and hnswlib is not None and self.vectors is not None):
+            return
+        ann = hnswlib.Index(space="ip", dim=self.dim)
+        ann_path = self._path("ann.bin")
+        if os.path.exists(ann_path):
+            ann.load_index(ann_path, max_elements=self.row_count)
+        else:
+            ann.init_index(max_elements=self.row_count, ef_construction=200, M=16)
+        # add rows appended since the ANN file was saved, then hide removed rows
+        if ann.get_current_count() < self.row_count:
+            new_rows = np.arange(ann.get_current_count(), self.row_count)
+            ann.resize_index(self.row_count)
+            ann.add_items(np.asarray(self.vectors[new_rows]), new_rows)
+        for row in self.removed_rows:
+            try:
+                ann.mark_deleted(int(row))
+            except RuntimeError:
+                pass  # already marked
+        ann.save_index(ann_path)
+        self.ann = ann
+
+    # <------- Search ------->
+
+    # Top k postings for a resume, each result is the posting info plus its score (0-100)
+    def search(self, resume_text, k=10):
+        self.refresh()
+        with self._lock:
+            if not self.postings:
+                return []
+            query = normalize_rows(encode_texts_cached([resume_text], self.model_name))[0]
+            k = min(k, len(self.postings))
+
+            if self.ann is not None:
+                self.ann.set_ef(max(50, k * 4))
+                rows, distances = self.ann.knn_query(query, k=k)
+                pairs = [(int(row), 1.0 - float(distance)) for row, distance in zip(rows[0], distances[0])]
+            else:
+                scores = np.asarray(self.vectors @ query)
+                scores[self.removed_rows] = -np.inf
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top])]
+                pairs = [(int(row), float(scores[row])) for row in top]
+
+            return [dict(self.postings[row], score=score * 100) for row, score in pairs]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+# one shared index per server process
+def get_job_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = JobIndex()
+    return _index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the job description library used for reverse matching.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="add or update postings from a JSONL / CSV file")
+    add.add_argument("path")
+    remove = commands.add_parser("remove", help="remove postings by id")
+    remove.add_argument("ids", nargs="+")
+    commands.add_parser("compact", help="rewrite the index without removed postings")
+    search = commands.add_parser("search", help="top matching jobs for a resume PDF or text file")
+    search.add_argument("resume")
+    search.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    index = JobIndex()
+    if args.command == "add":
+        jobs = load_jobs(args.path)
+        index.add(jobs)
+        print(f"Added {len(jobs)} postings, index now has {len(index)}")
+    elif args.command == "remove":
+        print(f"Removed {index.remove(args.ids)} postings, index now has {len(index)}")
+    elif args.command == "compact":
+        index.compact()
+        print(f"Compacted, index has {len(index)} postings")
+    elif args.command == "search":
+        if args.resume.lower().endswith(".pdf"):
+            resume_text = extract_text_from_pdf(args.resume)
+        else:
+            with open(args.resume, encoding="utf-8") as f:
+                resume_text = f.read()
+        for result in index.search(resume_text, args.k):
+            print(f"{result['score']:6.2f}  {result['id']}  {result['title']}  {result['company']}")
+
+
+if __name__ == "__main__":
+    main()
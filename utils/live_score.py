@@ -0,0 +1,119 @@
+import os # read the live score settings from the environment
+import hashlib # section vectors are kept by a hash of the section text
+import threading # the score is computed on a background thread, the debounce waits on a timer
+import time # debounce and timing
+import numpy as np # similarity matrix
+from dotenv import load_dotenv # extract settings from .env file
+from utils.chunking import split_into_sections, pool_similarity # same sections and pooling as the chunked ATS score
+from utils.embeddings import encode_texts_cached, normalize_rows # sections seen before come from the embedding cache
+from utils.workers import run_in_background # shared background threads
+from utils.artifacts import artifact_store # the texts are read from the shared store, the scorer only keeps handles
+
+load_dotenv()
+
+# wait this long after the last edit before scoring, so fast edits are scored once
+LIVE_SCORE_DEBOUNCE = float(os.getenv("LIVE_SCORE_DEBOUNCE_MS", "300")) / 1000
+
+
+def _section_key(section):
+    return hashlib.sha256(section.encode("utf-8")).hexdigest()
+
+
+# Re-scores a resume against one job description while it is edited, section by section like the "chunked" ATS score.
+# Only sections that changed since the last score are embedded again; the JD embedding is computed once.
+# job_desc and the texts passed to request() are artifact handles (see utils.artifacts), so the scorer does not keep
+# extra copies of the resume. request() never blocks: the latest text is scored in the background and older requests are dropped.
+# The debounce waits on a timer, a shared worker thread is only used once a score is actually due.
+class LiveScorer:
+    def __init__(self, job_desc, debounce=LIVE_SCORE_DEBOUNCE):
+        self.job_desc = job_desc
+        self.debounce = debounce
+        self.result = None  # {"score", "changed", "chunks", "ms"} of the last scored text
+        self.error = None
+        self._jd_vectors = None
+        self._section_vectors = {}  # section hash -> normalized vector, for the sections of the last scored text
+        self._lock = threading.Lock()
+        self._latest_text = None
+        self._scored_text = None
+        self._requested_at = 0.0
+        self._timer = None
+        self._running = False
+
+    @property
+    def pending(self):
+        return self._latest_text != self._scored_text
+
+    def request(self, text):
+        with self._lock:
+            if text == self._latest_text:
+                return
+            self._latest_text = text
+            self._requested_at = time.monotonic()
+            if self._timer is None and not self._running:
+                self._schedule(self.debounce)
+            # otherwise the waiting timer or the running score picks up the new text
+
+    # called with the lock held
+    def _schedule(self, delay):
+        self._timer = threading.Timer(max(0.0, delay), self._due)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _due(self):
+        with self._lock:
+            self._timer = None
+            wait = self._requested_at + self.debounce - time.monotonic()
+            if wait > 0:  # edited again while the timer was waiting
+                self._schedule(wait)
+                return
+            self._running = True
+        run_in_background(self._work)
+
+    def _work(self):
+        with self._lock:
+            handle = self._latest_text
+        try:
+            text = artifact_store.get(handle)
+            if text is None:
+                with self._lock:
+                    if handle != self._latest_text:
+                        return  # replaced by a newer edit in the meantime, that one is scored next
+                raise ValueError("The resume is no longer available, please analyze it again.")
+            result = self.score(text)
+            with self._lock:
+                self.result = result
+                self._scored_text = handle
+        except Exception as e:
+            with self._lock:
+                self.error = e
+        finally:
+            with self._lock:
+                self._running = False
+                if self.error is None and self._latest_text != self._scored_text:
+                    self._schedule(self._requested_at + self.debounce - time.monotonic())
+
+    # score a text right away (used by the background worker)
+    def score(self, text):
+        start = time.perf_counter()
+        if self._jd_vectors is None:
+            job_desc = artifact_store.get(self.job_desc)
+            if job_desc is None:
+                raise ValueError("The job description is no longer available, please analyze the resume again.")
+            self._jd_vectors = normalize_rows(encode_texts_cached(split_into_sections(job_desc) or [""]))
+
+        sections = split_into_sections(text) or [""]
+        keys = [_section_key(section) for section in sections]
+        changed = {key: section for key, section in zip(keys, sections) if key not in self._section_vectors}
+        if changed:
+            for key, vector in zip(changed, normalize_rows(encode_texts_cached(list(changed.values())))):
+                self._section_vectors[key] = vector
+        # forget sections that were edited away
+        self._section_vectors = {key: self._section_vectors[key] for key in keys}
+
+        matrix = np.vstack([self._section_vectors[key] for key in keys]) @ self._jd_vectors.T
+        return {
+            "score": pool_similarity(matrix) * 100,
+            "changed": len(changed),
+            "chunks": len(sections),
+            "ms": (time.perf_counter() - start) * 1000,
+        }
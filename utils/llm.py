@@ -0,0 +1,256 @@
+import os # read the API key and limits from the environment
+import hashlib # identical prompts share one in-flight call
+import random # jitter for the retry delays
+import threading # one client, one limiter and one table of in-flight calls per process
+import time # rate limiting, backoff and latency
+from collections import deque # recent latencies for the metrics
+from dotenv import load_dotenv # extract API Key from .env file
+from utils.telemetry import record, count # call timings and token / call counters
+
+load_dotenv()
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Limits of the Groq account, shared by every session in this server process
+GROQ_REQUESTS_PER_MINUTE = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000"))
+GROQ_EXPECTED_OUTPUT_TOKENS = int(os.getenv("GROQ_EXPECTED_OUTPUT_TOKENS", "1000"))  # reserved per call for the answer
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "4"))
+GROQ_BACKOFF_SECONDS = float(os.getenv("GROQ_BACKOFF_SECONDS", "1"))  # first retry waits about this long
+GROQ_BACKOFF_MAX_SECONDS = float(os.getenv("GROQ_BACKOFF_MAX_SECONDS", "30"))
+
+
+# Shown to the user instead of a raw API exception
+class LLMError(RuntimeError):
+    pass
+
+
+# Token bucket: holds up to per_minute units and refills at per_minute / 60 units per second
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # wait until amount units are available and take them
+    def acquire(self, amount):
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(min(wait, 1.0))
+
+
+# one call to the API that any number of sessions can read from while it streams
+class _Flight:
+    def __init__(self):
+        self.parts = []
+        self.done = False
+        self.error = None
+        self.readers = 0
+        self.condition = threading.Condition()
+
+    def push(self, piece):
+        with self.condition:
+            self.parts.append(piece)
+            self.condition.notify_all()
+
+    def finish(self, error=None):
+        with self.condition:
+            self.done = True
+            self.error = error
+            self.condition.notify_all()
+
+    def read(self):
+        index = 0
+        while True:
+            with self.condition:
+                while index >= len(self.parts) and not self.done:
+                    self.condition.wait()
+                new_parts = self.parts[index:]
+                index = len(self.parts)
+                done, error = self.done, self.error
+            yield from new_parts
+            if done and index >= len(self.parts):
+                if error is not None:
+                    raise error
+                return
+
+
+_client = None
+_client_lock = threading.Lock()
+_request_bucket = TokenBucket(GROQ_REQUESTS_PER_MINUTE)
+_token_bucket = TokenBucket(GROQ_TOKENS_PER_MINUTE)
+_flights = {}
+_flights_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+_metrics = {"requests": 0, "coalesced": 0, "retries": 0, "rate_limited": 0, "errors": 0, "queue_depth": 0}
+_latencies = deque(maxlen=500)
+
+
+def _count(name, amount=1):
+    with _metrics_lock:
+        _metrics[name] += amount
+
+
+# one Groq client (one pooled keep-alive HTTP connection pool) per server process; retries are done here instead
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from groq import Groq # API for genrating ai report, imported on the first call
+                _client = Groq(api_key=GROQ_API_KEY, max_retries=0)
+    return _client
+
+
+# True (and the flight is dropped, so nobody new joins it) when every reader has gone away
+def _abandoned(key, flight):
+    with _flights_lock:
+        if flight.readers == 0:
+            if _flights.get(key) is flight:
+                del _flights[key]
+            return True
+        return False
+
+
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+def _backoff(attempt, error):
+    retry_after = None
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after) + random.uniform(0, 1)
+        except ValueError:
+            pass
+    # exponential backoff with full jitter
+    return random.uniform(0, min(GROQ_BACKOFF_MAX_SECONDS, GROQ_BACKOFF_SECONDS * 2 ** attempt))
+
+
+# runs on its own thread: rate limit, call the API (with retries) and push the answer into the flight
+def _produce(key, flight, prompt, model, stream, on_complete):
+    import groq # error types for the retries
+    retry_errors = (groq.RateLimitError, groq.APIConnectionError, groq.InternalServerError)
+    start = time.monotonic()
+    ok = False
+    try:
+        _count("queue_depth")
+        try:
+            _request_bucket.acquire(1)
+            _token_bucket.acquire(estimate_tokens(prompt) + GROQ_EXPECTED_OUTPUT_TOKENS)
+        finally:
+            _count("queue_depth", -1)
+        if _abandoned(key, flight):
+            flight.finish(LLMError("Generation was cancelled."))
+            return
+
+        for attempt in range(GROQ_MAX_RETRIES + 1):
+            try:
+                _count("requests")
+                count("llm_api_calls")
+                completion = get_client().chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=model,
+                    stream=stream,
+                )
+                if not stream:
+                    flight.push(completion.choices[0].message.content)
+                else:
+                    for chunk in completion:
+                        # everybody stopped reading (e.g. Stop button / rerun): cancel the call
+                        if _abandoned(key, flight):
+                            completion.close()
+                            flight.finish(LLMError("Generation was cancelled."))
+                            return
+                        piece = chunk.choices[0].delta.content
+                        if piece:
+                            if not flight.parts:
+                                record("llm_first_token", time.monotonic() - start, model=model)
+                            flight.push(piece)
+                break
+            except retry_errors as e:
+                if isinstance(e, groq.RateLimitError):
+                    _count("rate_limited")
+                # a stream that already sent text cannot be retried without repeating it
+                if flight.parts or attempt == GROQ_MAX_RETRIES:
+                    raise
+                _count("retries")
+                time.sleep(_backoff(attempt, e))
+
+        text = "".join(flight.parts)
+        # estimates, the streamed answer does not carry the exact usage
+        count("llm_prompt_tokens", estimate_tokens(prompt))
+        count("llm_completion_tokens", estimate_tokens(text))
+        ok = True
+        if on_complete is not None:
+            on_complete(text)
+        flight.finish()
+    except Exception as e:
+        _count("errors")
+        if isinstance(e, groq.RateLimitError):
+            e = LLMError("The AI service is busy right now, please try again in a minute.")
+        elif isinstance(e, groq.APIError):
+            e = LLMError(f"The AI service returned an error: {e}")
+        flight.finish(e)
+    finally:
+        with _metrics_lock:
+            _latencies.append(time.monotonic() - start)
+        record("llm_call", time.monotonic() - start, ok=ok, model=model)
+        with _flights_lock:
+            if _flights.get(key) is flight:
+                del _flights[key]
+
+
+# Send a prompt to Groq and yield the answer piece by piece.
+# Identical prompts that are already in flight are not sent again: every caller reads the same stream.
+# on_complete(text) is called once with the full answer (not when the call fails or is cancelled).
+def stream_chat(prompt, model, stream=True, on_complete=None):
+    key = hashlib.sha256(f"{model}\0{stream}\0{prompt}".encode("utf-8")).hexdigest()
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.readers = 1
+            _flights[key] = flight
+            threading.Thread(
+                target=_produce, args=(key, flight, prompt, model, stream, on_complete), daemon=True
+            ).start()
+        else:
+            _count("coalesced")
+            with flight.condition:
+                flight.readers += 1
+    try:
+        yield from flight.read()
+    finally:
+        with flight.condition:
+            flight.readers -= 1
+
+
+# Same as stream_chat but waits for the full answer
+def chat(prompt, model):
+    return "".join(stream_chat(prompt, model, stream=False))
+
+
+# numbers for monitoring: calls waiting on the rate limiter, calls in flight, latency percentiles, ...
+def llm_metrics():
+    with _metrics_lock:
+        metrics = dict(_metrics)
+        latencies = sorted(_latencies)
+    with _flights_lock:
+        metrics["in_flight"] = len(_flights)
+    if latencies:
+        metrics["latency_p50"] = latencies[len(latencies) // 2]
+        metrics["latency_p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return metrics
@@ -0,0 +1,87 @@
+import os # read the batching settings from the environment
+import threading # requests from many threads are collected by one encoding thread
+import time # how long to wait for more requests
+from concurrent.futures import Future # every caller waits for its own part of the batch
+from dotenv import load_dotenv # extract settings from .env file
+from utils.embeddings import encode_texts_cached # one cached, batched encode for the whole micro-batch
+from utils.telemetry import record, count # batch sizes and waiting time
+
+load_dotenv()
+
+# a batch is sent to the model when it has this many texts or when the first request has waited this long
+MICROBATCH_MAX_TEXTS = int(os.getenv("MICROBATCH_MAX_TEXTS", "64"))
+MICROBATCH_WAIT_MS = float(os.getenv("MICROBATCH_WAIT_MS", "5"))
+
+
+# Collects encode requests from concurrent callers (e.g. API requests) and encodes them together,
+# so the model runs one large batch instead of many small ones. encode() blocks like encode_texts_cached.
+class EmbeddingBatcher:
+    def __init__(self, max_texts=MICROBATCH_MAX_TEXTS, wait_ms=MICROBATCH_WAIT_MS):
+        self.max_texts = max_texts
+        self.wait = wait_ms / 1000
+        self._pending = []  # (texts, future)
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, texts):
+        future = Future()
+        with self._condition:
+            self._pending.append((list(texts), future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def encode(self, texts):
+        return self.submit(texts).result()
+
+    def _next_batch(self):
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+            # wait a little for other requests to join, unless the batch is already full
+            deadline = time.monotonic() + self.wait
+            while sum(len(texts) for texts, _ in self._pending) < self.max_texts:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch, size = [], 0
+            while self._pending and (not batch or size + len(self._pending[0][0]) <= self.max_texts):
+                texts, future = self._pending.pop(0)
+                batch.append((texts, future))
+                size += len(texts)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            all_texts = [text for texts, _ in batch for text in texts]
+            start = time.perf_counter()
+            try:
+                vectors = encode_texts_cached(all_texts) if all_texts else []
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            record("microbatch_encode", time.perf_counter() - start, requests=len(batch), texts=len(all_texts))
+            count("microbatch_requests", len(batch))
+            position = 0
+            for texts, future in batch:
+                future.set_result(vectors[position:position + len(texts)])
+                position += len(texts)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+# one batcher per process, shared by every request
+def get_batcher():
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = EmbeddingBatcher()
+    return _batcher
@@ -0,0 +1,68 @@
+import os # find a Unicode font
+import hashlib # rendered PDFs are cached by a hash of the text
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import LRUCache # keeps recently rendered PDFs
+from utils.telemetry import stage, count # render timings and cache hits
+
+load_dotenv()
+
+# A TrueType font with Unicode characters (e.g. DejaVuSans.ttf); without one, text is written in Arial
+# and characters outside latin-1 are replaced by "?"
+FONT_CANDIDATES = [
+    os.getenv("RESUME_PDF_FONT", ""),
+    "fonts/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+]
+UNICODE_FONT = next((path for path in FONT_CANDIDATES if path and os.path.exists(path)), None)
+PDF_RENDER_CACHE_MB = int(os.getenv("PDF_RENDER_CACHE_MB", "64"))
+
+_pdf_cache = LRUCache(PDF_RENDER_CACHE_MB * 1024 * 1024)
+
+
+def _set_font(pdf):
+    if UNICODE_FONT:
+        try:
+            pdf.add_font("Unicode", "", UNICODE_FONT, uni=True)  # fpdf 1.7
+        except TypeError:
+            pdf.add_font("Unicode", "", UNICODE_FONT)  # fpdf2 is always Unicode
+        pdf.set_font("Unicode", size=12)
+        return True
+    pdf.set_font("Arial", size=12)
+    return False
+
+
+# Render plain text to PDF bytes in memory (no temporary files)
+def _render(text):
+    from fpdf import FPDF # genrate pdf, imported on the first export
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=10)
+    unicode_font = _set_font(pdf)
+
+    for line in text.strip().split("\n"):
+        if not unicode_font:
+            line = line.encode("latin-1", "replace").decode("latin-1")
+        try:
+            pdf.multi_cell(0, 10, line)
+        except Exception:
+            continue
+
+    output = pdf.output(dest="S")
+    # fpdf 1.7 returns a latin-1 string, fpdf2 returns a bytearray
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+
+# PDF of a resume, the same text is only rendered once
+def render_resume_pdf(text):
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    pdf_bytes = _pdf_cache.get(key)
+    if pdf_bytes is None:
+        count("pdf_render_cache_misses")
+        with stage("pdf_render"):
+            pdf_bytes = _render(text)
+        _pdf_cache.set(key, pdf_bytes, len(pdf_bytes))
+    else:
+        count("pdf_render_cache_hits")
+    return pdf_bytes
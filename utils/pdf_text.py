@@ -0,0 +1,157 @@
+import os # read the extraction settings from the environment
+import io # wrap raw PDF bytes as a file
+import hashlib # content hash of the PDF used as the cache key
+import logging # warn about PDFs that are very slow to extract
+import multiprocessing # worker processes are started with "spawn", never forked from the server
+import signal # cheaper timeout when we are on the main thread (e.g. batch workers)
+import threading # check which thread we are on
+import time # extraction time per document
+from collections import deque # keep the most recent extraction times
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout # long-lived extraction workers
+from concurrent.futures.process import BrokenProcessPool # the pool was stopped because another PDF timed out
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import LRUCache # extracted text cached by PDF hash
+from utils.telemetry import record, count # stage timings and cache hit counters
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Extraction settings, can be changed from the .env file
+PDF_ENGINE = os.getenv("PDF_ENGINE", "pdfminer")  # "pdfminer" or "pymupdf"
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))  # 0 reads every page
+PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", "30"))  # seconds before a PDF is given up on, 0 turns the guard off
+PDF_SLOW_SECONDS = float(os.getenv("PDF_SLOW_SECONDS", "5"))  # extraction slower than this is logged
+PDF_CACHE_MB = int(os.getenv("PDF_CACHE_MB", "64"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))  # extraction processes used off the main thread (uploads, API)
+# pdfminer's advanced layout analysis (boxes_flow) is the slowest part and resumes rarely need it
+PDF_LAYOUT_ANALYSIS = os.getenv("PDF_LAYOUT_ANALYSIS", "0") == "1"
+
+LA_PARAMS = dict(line_margin=0.5, char_margin=2.0, boxes_flow=0.5 if PDF_LAYOUT_ANALYSIS else None)
+
+_text_cache = LRUCache(PDF_CACHE_MB * 1024 * 1024)
+# (seconds, engine, size in bytes) of the latest extractions, to spot outliers
+extraction_times = deque(maxlen=1000)
+
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):  # Streamlit UploadedFile / BytesIO
+        return source.getvalue()
+    return source.read()
+
+
+# the PDF libraries are imported on the first extraction, not when a page opens
+def _extract(data, engine=PDF_ENGINE, max_pages=PDF_MAX_PAGES):
+    if engine == "pymupdf":
+        try:
+            import fitz # PyMuPDF, optional and much faster than pdfminer
+        except ImportError:
+            fitz = None
+        if fitz is not None:
+            with fitz.open(stream=data, filetype="pdf") as document:
+                pages = document if not max_pages else document.pages(0, min(max_pages, document.page_count))
+                return "".join(page.get_text() for page in pages)
+    from pdfminer.high_level import extract_text # extract text from pdf
+    from pdfminer.layout import LAParams # layout analysis settings
+    return extract_text(io.BytesIO(data), maxpages=max_pages, laparams=LAParams(**LA_PARAMS))
+
+
+# runs in a worker process; errors are sent back as text because some PDF library exceptions cannot be pickled
+def _extract_in_worker(data, engine, max_pages):
+    try:
+        return True, _extract(data, engine, max_pages)
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Worker processes kept for the whole server. They are spawned (a fresh interpreter without the model),
+# because forking a server with many threads and a loaded torch model is slow and can deadlock.
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+# a timed out extraction keeps its worker busy forever, so the pool is replaced and its processes stopped
+def _recycle_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    # ProcessPoolExecutor cannot cancel a running task, its processes have to be terminated
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _on_alarm(signum, frame):
+    raise TimeoutError(f"PDF extraction took longer than {PDF_TIMEOUT:.0f}s")
+
+
+# Stop pathological PDFs from blocking the app: a SIGALRM on the main thread, otherwise a worker process
+def _extract_with_timeout(data, engine, max_pages):
+    if not PDF_TIMEOUT:
+        return _extract(data, engine, max_pages)
+
+    if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGALRM"):
+        previous = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, PDF_TIMEOUT)
+        try:
+            return _extract(data, engine, max_pages)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            ok, result = pool.submit(_extract_in_worker, data, engine, max_pages).result(timeout=PDF_TIMEOUT)
+            break
+        except FutureTimeout:
+            _recycle_pool(pool)
+            raise TimeoutError(f"PDF extraction took longer than {PDF_TIMEOUT:.0f}s")
+        except BrokenProcessPool:
+            # the pool was recycled for another PDF (or a worker crashed), try once more in a new one
+            _recycle_pool(pool)
+            if attempt:
+                raise
+    if not ok:
+        raise ValueError(result)
+    return result
+
+
+# Extract the text of a PDF, source can be a path, a file-like object (e.g. a Streamlit upload) or raw bytes.
+# The same PDF uploaded again is answered from the cache.
+def extract_text_from_pdf(source, engine=PDF_ENGINE, max_pages=PDF_MAX_PAGES):
+    data = _read_bytes(source)
+    key = hashlib.sha256(data).hexdigest() + f":{engine}:{max_pages}"
+    text = _text_cache.get(key)
+    if text is not None:
+        count("pdf_cache_hits")
+        return text
+    count("pdf_cache_misses")
+
+    start = time.perf_counter()
+    try:
+        text = _extract_with_timeout(data, engine, max_pages)
+    except Exception:
+        record("pdf_extract", time.perf_counter() - start, ok=False, engine=engine, bytes=len(data))
+        raise
+    seconds = time.perf_counter() - start
+    extraction_times.append((seconds, engine, len(data)))
+    record("pdf_extract", seconds, engine=engine, bytes=len(data))
+    if seconds > PDF_SLOW_SECONDS:
+        logger.warning("Slow PDF extraction: %.1fs for a %d byte PDF (%s)", seconds, len(data), engine)
+
+    _text_cache.set(key, text, len(text) * 2 + len(key))
+    return text
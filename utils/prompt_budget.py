@@ -0,0 +1,191 @@
+import os # read the token budgets from the environment
+import re # clean up extracted text
+import logging # log the tokens saved per request
+import threading # totals are shared by every session
+from dotenv import load_dotenv # extract settings from .env file
+from utils.chunking import split_into_chunks # resume sections that are too long are ranked window by window
+from utils.embeddings import encode_texts_cached, normalize_rows # rank resume sections by relevance to the JD
+
+try:
+    import tiktoken # local tokenizer (in requirements.txt), without it ~4 characters per token
+except ImportError:
+    tiktoken = None
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Most tokens a prompt may use for each model (the answer needs room in the context window too).
+# Override with PROMPT_TOKEN_BUDGETS="llama-3.3-70b-versatile=8000,llama3-8b-8192=3000"
+MODEL_TOKEN_BUDGETS = {
+    "llama-3.3-70b-versatile": 6000,
+    "llama3-8b-8192": 4000,
+}
+for _item in os.getenv("PROMPT_TOKEN_BUDGETS", "").split(","):
+    if "=" in _item:
+        _model, _tokens = _item.split("=", 1)
+        MODEL_TOKEN_BUDGETS[_model.strip()] = int(_tokens)
+DEFAULT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "4000"))  # models not listed above
+JD_BUDGET_SHARE = 0.4  # the job description never takes more than this part of the budget
+# "Page 2 of 3", "page 4", "2 / 3": removed when they start or end a page
+PAGE_NUMBER = re.compile(r"^(page \d+( (of|/) \d+)?|\d+ (of|/) \d+)$")
+
+_encoding = None
+_totals_lock = threading.Lock()
+_totals = {"requests": 0, "compacted": 0, "tokens_before": 0, "tokens_after": 0}
+
+
+def token_budget(model):
+    return MODEL_TOKEN_BUDGETS.get(model, DEFAULT_TOKEN_BUDGET)
+
+
+# Tokens in text, counted locally (no API call)
+def count_tokens(text):
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")  # close enough to the Llama tokenizer for budgeting
+        except Exception:  # the encoding file is downloaded on first use, e.g. no internet access
+            logger.warning("tiktoken encoding not available, counting ~4 characters per token")
+            _encoding = False
+    if not _encoding:
+        return (len(text) + 3) // 4
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def _line_key(line):
+    return " ".join(line.lower().split())
+
+
+# Remove running headers / footers: a line that starts or ends several pages with exactly the same text
+# is kept only the first time, page numbers at the start or end of a page are removed.
+# Lines in the middle of a page are never touched (e.g. the dates of every job).
+def _remove_page_furniture(pages):
+    page_lines = [page.split("\n") for page in pages]
+    edges, seen = [], {}
+    for lines in page_lines:
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        edge = sorted(set(filled[:2] + filled[-2:]))
+        edges.append(edge)
+        for key in {_line_key(lines[i]) for i in edge}:
+            seen[key] = seen.get(key, 0) + 1
+    repeated = {key for key, count in seen.items() if count > 1}
+
+    kept_headers = set()
+    for lines, edge in zip(page_lines, edges):
+        for i in edge:
+            key = _line_key(lines[i])
+            if PAGE_NUMBER.match(key) or key in kept_headers:
+                lines[i] = ""
+            elif key in repeated:
+                kept_headers.add(key)
+    return ["\n".join(lines) for lines in page_lines]
+
+
+# Clean text extracted from a PDF before it goes into a prompt:
+# form feeds, hyphenated line breaks, whitespace runs, headers / footers repeated on every page
+# and paragraphs that appear more than once
+def normalize_text(text):
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\x00", "")
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)  # "develop-\nment" -> "development"
+
+    pages = text.split("\f")
+    if len(pages) > 1:
+        text = "\f".join(_remove_page_furniture(pages))
+
+    paragraphs, seen_paragraphs = [], set()
+    for paragraph in re.split(r"\n\s*\n|\f", text):
+        lines = []
+        for line in paragraph.split("\n"):
+            line = re.sub(r"[ \t\u00a0\v]+", " ", line).strip()
+            if not line:
+                continue
+            if lines and lines[-1] == line:
+                continue  # the same line twice in a row
+            lines.append(line)
+        paragraph = "\n".join(lines)
+        if paragraph and paragraph.lower() not in seen_paragraphs:
+            seen_paragraphs.add(paragraph.lower())
+            paragraphs.append(paragraph)
+    return "\n\n".join(paragraphs)
+
+
+def _truncate(text, max_tokens):
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = text.split(" ")
+    low, high = 0, len(words)
+    while low < high:  # longest prefix of words that fits
+        middle = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:middle])) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low])
+
+
+# Keep the resume sections most relevant to the job description (in their original order) within max_tokens
+def _keep_relevant_sections(resume, job_desc, max_tokens):
+    sections = []
+    for paragraph in resume.split("\n\n"):
+        if len(paragraph.split()) > 200:
+            sections.extend(split_into_chunks(paragraph))
+        else:
+            sections.append(paragraph)
+
+    if job_desc.strip():
+        jd_chunks = split_into_chunks(job_desc) or [""]
+        vectors = normalize_rows(encode_texts_cached(sections + jd_chunks))
+        relevance = (vectors[:len(sections)] @ vectors[len(sections):].T).max(axis=1)
+        order = sorted(range(len(sections)), key=lambda i: -relevance[i])
+    else:
+        order = range(len(sections))  # nothing to rank against, keep the top of the resume
+
+    kept, used = set(), 0
+    for i in order:
+        tokens = count_tokens(sections[i]) + 1
+        if used + tokens <= max_tokens:
+            kept.add(i)
+            used += tokens
+    return "\n\n".join(sections[i] for i in sorted(kept)), len(sections) - len(kept)
+
+
+# Clean the resume and job description and make the prompt fit the token budget of the model.
+# build_prompt(resume, job_desc) returns the full prompt; returns (prompt, stats) where stats has
+# tokens_before, tokens_after, tokens_saved, budget and dropped_sections
+def fit_prompt(build_prompt, resume, job_desc, model):
+    budget = token_budget(model)
+    tokens_before = count_tokens(build_prompt(resume, job_desc))
+
+    resume = normalize_text(resume)
+    job_desc = normalize_text(job_desc)
+    prompt = build_prompt(resume, job_desc)
+    dropped = 0
+    if count_tokens(prompt) > budget:
+        available = budget - count_tokens(build_prompt("", ""))
+        job_desc = _truncate(job_desc, int(available * JD_BUDGET_SHARE))
+        resume, dropped = _keep_relevant_sections(resume, job_desc, available - count_tokens(job_desc))
+        prompt = build_prompt(resume, job_desc)
+
+    tokens_after = count_tokens(prompt)
+    stats = {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+        "budget": budget,
+        "dropped_sections": dropped,
+    }
+    with _totals_lock:
+        _totals["requests"] += 1
+        _totals["compacted"] += dropped > 0
+        _totals["tokens_before"] += tokens_before
+        _totals["tokens_after"] += tokens_after
+    logger.info("prompt for %s: %d -> %d tokens (%d sections dropped)", model, tokens_before, tokens_after, dropped)
+    return prompt, stats
+
+
+# tokens saved since the server started, for monitoring
+def budget_metrics():
+    with _totals_lock:
+        totals = dict(_totals)
+    totals["tokens_saved"] = totals["tokens_before"] - totals["tokens_after"]
+    return totals
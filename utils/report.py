@@ -0,0 +1,66 @@
+import os # read the report settings from the environment
+from dotenv import load_dotenv # extract settings from .env file
+from utils.llm import stream_chat # shared Groq client with rate limiting, retries and request coalescing
+from utils.prompt_budget import fit_prompt, token_budget # clean the inputs and keep the prompt within the model budget
+from utils.report_cache import report_cache # reuse reports already generated for the same resume + job description
+
+load_dotenv() # load environment
+
+REPORT_MODEL = "llama-3.3-70b-versatile" # Groq model used for the analysis report
+REPORT_PROMPT_VERSION = "2" # change this whenever the prompt below changes so old cached reports are not reused
+REPORT_STREAMING = os.getenv("REPORT_STREAMING", "1") == "1" # show the report while it is being generated
+
+
+# Sends a prompt to Groq and yields the answer piece by piece as it arrives, then stores it in cache under cache_key.
+# Call it after cache.get(cache_key) missed (it does not look the key up again, so a miss is counted once);
+# only a finished answer is cached, a stream cut off by a rerun (or a Stop button) is thrown away.
+def stream_completion(prompt, model, cache, cache_key, stream=REPORT_STREAMING):
+    # sessions asking for the same prompt at the same time share one API call
+    yield from stream_chat(prompt, model, stream=stream, on_complete=lambda text: cache.set(cache_key, text))
+
+# the analysis prompt for a resume and a job description
+def build_report_prompt(resume,job_desc):
+    return f"""
+    # Context:
+    - You are an AI Resume Analyzer, you will be given Candidate's resume and Job Description of the role he is applying for.
+
+    # Instruction:
+    - Analyze candidate's resume based on the possible points that can be extracted from job description,and give your evaluation on each point with the criteria below:  
+    - Consider all points like required skills, experience,etc that are needed for the job role.
+    - Calculate the score to be given (out of 5) for every point based on evaluation at the beginning of each point with a detailed explanation.  
+    - If the resume aligns with the job description point, mark it with ✅ and provide a detailed explanation.  
+    - If the resume doesn't align with the job description point, mark it with ❌ and provide a reason for it.  
+    - If a clear conclusion cannot be made, use a ⚠️ sign with a reason. 
+    - After the evaluation, **create a section named "Missing Skills List"**. 
+    - In "Missing Skills List", **list 3-5 key technical or domain skills** that are present in the job description but missing from the resume.
+    - The Final Heading should be "Suggestions to improve your resume:" and give where and what the candidate can improve to be selected for that job role.
+
+    # Inputs:
+    Candidate Resume: {resume}
+    ---
+    Job Description: {job_desc}
+
+    # Output:
+    - Each any every point should be given a score (example: 3/5 ). 
+    - Mention the scores and  relevant emoji at the beginning of each point and then explain the reason.
+    - A separate section at the end titled **Missing Skills List:** with bullet points or JSON list bullet points cam be emojies.
+    """
+
+# sends resume and jd to the ai to genrate the report, yields the report piece by piece as it arrives
+# pass a dict as budget_stats to get the token counts of the prompt (empty when the report came from the cache)
+def stream_report(resume,job_desc,budget_stats=None):
+    # same resume + job description + model + prompt gives the same report, so answer from the cache if we can
+    cache_key = report_cache.make_key(resume, job_desc, REPORT_MODEL, REPORT_PROMPT_VERSION, str(token_budget(REPORT_MODEL)))
+    cached_report = report_cache.get(cache_key)
+    if cached_report is not None:
+        yield cached_report
+        return
+
+    prompt, stats = fit_prompt(build_report_prompt, resume, job_desc, REPORT_MODEL)
+    if budget_stats is not None:
+        budget_stats.update(stats)
+    yield from stream_chat(prompt, REPORT_MODEL, stream=REPORT_STREAMING, on_complete=lambda text: report_cache.set(cache_key, text))
+
+# same as stream_report but waits for the full report
+def get_report(resume,job_desc):
+    return "".join(stream_report(resume,job_desc))
@@ -0,0 +1,89 @@
+import os # read cache settings from the environment
+import hashlib # hash of the inputs used as the cache key
+import threading # counters are updated from many sessions
+import time # TTL check
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import LRUCache, SQLiteStore # memory and disk cache tiers
+from utils.telemetry import count # hits and misses per cache for the metrics
+
+load_dotenv()
+
+# Report cache settings, can be changed from the .env file
+REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", str(24 * 3600)))  # seconds a report stays valid
+REPORT_CACHE_MAX_ITEMS = int(os.getenv("REPORT_CACHE_MAX_ITEMS", "500"))  # reports kept in memory
+REPORT_CACHE_DISK = os.getenv("REPORT_CACHE_DISK", "0") == "1"  # also keep reports on disk
+REPORT_CACHE_DISK_MB = int(os.getenv("REPORT_CACHE_DISK_MB", "256"))
+
+
+# Caches LLM generated text keyed by a hash of everything that changes the answer
+class ReportCache:
+    def __init__(self, name, ttl=REPORT_CACHE_TTL, max_items=REPORT_CACHE_MAX_ITEMS, disk=REPORT_CACHE_DISK):
+        self.name = name
+        self.ttl = ttl
+        self._memory = LRUCache(max_items)  # every report counts as size 1, so this limits the number of reports
+        self._disk = SQLiteStore(name, REPORT_CACHE_DISK_MB * 1024 * 1024) if disk else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts):
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        count(f"{self.name}_cache_{'hits' if hit else 'misses'}")
+
+    # Returns the cached text or None when missing / expired
+    def get(self, key):
+        now = time.time()
+        item = self._memory.get(key)
+        if item is not None:
+            text, created = item
+            if now - created <= self.ttl:
+                self._count(True)
+                return text
+            self._memory.delete(key)
+
+        if self._disk is not None:
+            row = self._disk.get(key)
+            if row is not None:
+                value, created = row
+                if now - created <= self.ttl:
+                    text = value.decode("utf-8")
+                    self._memory.set(key, (text, created), 1)
+                    self._count(True)
+                    return text
+                self._disk.delete(key)
+
+        self._count(False)
+        return None
+
+    def set(self, key, text):
+        self._memory.set(key, (text, time.time()), 1)
+        if self._disk is not None:
+            self._disk.set(key, text.encode("utf-8"))
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._memory),
+            }
+
+
+# one shared cache per server process for the analysis reports
+report_cache = ReportCache("reports")
+# and one for the AI resume suggestions on the Edit Resume page
+suggestion_cache = ReportCache("suggestions")
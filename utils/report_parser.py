@@ -0,0 +1,108 @@
+import re # regular expression function extract pattens from the text
+import time # parsing time is added up over the chunks
+from utils.telemetry import record # one "report_parse" timing per report
+
+# Scores in the format x/5, where x can be an integer or a float
+SCORE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)/5')
+# Start and end of the "Missing Skills List" section
+MISSING_SKILLS_HEADING = re.compile(r"Missing Skills List\s*:\s*", re.IGNORECASE)
+SUGGESTIONS_HEADING = re.compile(r"Suggestions to improve", re.IGNORECASE)
+# how much text to keep around a chunk border so a heading split across two chunks is still found
+HEADING_OVERLAP = 200
+
+
+# Reads the AI report chunk by chunk (as it is streamed) and keeps the scores and missing skills up to date,
+# so nothing has to re-scan the full report at the end
+class ReportParser:
+    def __init__(self):
+        self._parts = []
+        self.scores = []
+        self.missing_skills = []
+        self._score_buffer = ""  # text after the last whitespace, a score may still be arriving in it
+        self._state = "heading"  # heading -> section -> done
+        self._window = ""  # recent text searched for the "Missing Skills List" heading
+        self._section = ""  # text after the heading, searched for "Suggestions to improve"
+        self._section_pos = 1
+        self._seconds = 0.0  # time spent parsing so far
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        start = time.perf_counter()
+        self._parts.append(chunk)
+        self._feed_scores(chunk)
+        self._feed_sections(chunk)
+        self._seconds += time.perf_counter() - start
+
+    # call once the stream is over to read the scores left in the buffer
+    def finish(self):
+        start = time.perf_counter()
+        self._read_scores(self._score_buffer)
+        self._score_buffer = ""
+        record("report_parse", self._seconds + time.perf_counter() - start, chunks=len(self._parts))
+        return self
+
+    def average_score(self):
+        # Example: [3, 4, 5] -> 80.0
+        if not self.scores:
+            return 0.0
+        return (sum(self.scores) / (5 * len(self.scores))) * 100
+
+    def _read_scores(self, text):
+        self.scores.extend(float(match) for match in SCORE_PATTERN.findall(text))
+
+    def _feed_scores(self, chunk):
+        # a score never contains whitespace, so everything up to the last whitespace can be scanned safely
+        buffer = self._score_buffer + chunk
+        cut = max(buffer.rfind(" "), buffer.rfind("\n"), buffer.rfind("\t"))
+        if cut == -1:
+            self._score_buffer = buffer
+            return
+        self._read_scores(buffer[:cut + 1])
+        self._score_buffer = buffer[cut + 1:]
+
+    def _feed_sections(self, chunk):
+        if self._state == "heading":
+            self._window += chunk
+            match = MISSING_SKILLS_HEADING.search(self._window)
+            if match is None:
+                self._window = self._window[-HEADING_OVERLAP:]
+                return
+            self._state = "section"
+            chunk = self._window[match.end():]
+            self._window = ""
+
+        if self._state == "section":
+            self._section += chunk
+            match = SUGGESTIONS_HEADING.search(self._section, self._section_pos)
+            if match is None:
+                # next time only look at the new text (plus enough to catch a split heading)
+                self._section_pos = max(1, len(self._section) - len("Suggestions to improve"))
+                return
+            self.missing_skills = parse_missing_skills(self._section[:match.start()])
+            self._state = "done"
+            self._section = ""
+
+
+# turns the text of the "Missing Skills List" section into a list of skills
+def parse_missing_skills(section):
+    lines = [line.strip("–-•*🔸•➡️ ").strip() for line in section.strip().splitlines()]
+    skills = [line for line in lines if line and not line.lower().startswith("suggestions")]
+    return skills[:5]
+
+
+# used to extract score from ai generated report to calculate average, calculate the average AI rating
+def extract_scores(text):
+    parser = ReportParser()
+    parser.feed(text)
+    return parser.finish().scores
+
+
+def extract_missing_skills_from_ai_section(report: str):
+    parser = ReportParser()
+    parser.feed(report)
+    return parser.finish().missing_skills
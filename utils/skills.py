@@ -0,0 +1,138 @@
+import os # read the taxonomy path and settings from the environment
+import json # the taxonomy is a JSON file
+import re # context words around ambiguous skill names
+import threading # the matcher is built once per process
+from collections import deque # breadth first walk while building the automaton
+from dotenv import load_dotenv # extract settings from .env file
+from utils.embeddings import encode_texts_cached, normalize_rows # optional fuzzy matching of near-synonyms
+
+load_dotenv()
+
+# {"Canonical skill": ["alias", ...], ...}; point this at a bigger taxonomy (tens of thousands of terms work fine)
+SKILL_TAXONOMY = os.getenv("SKILL_TAXONOMY", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skills.json"))
+SKILL_FUZZY = os.getenv("SKILL_FUZZY", "0") == "1"  # also treat near-synonyms (by embedding) as present
+SKILL_FUZZY_THRESHOLD = float(os.getenv("SKILL_FUZZY_THRESHOLD", "0.8"))
+SKILL_CONTEXT_CHARS = 100  # an ambiguous skill name needs one of its context words this close (before or after)
+
+
+def normalize_term(text):
+    return " ".join(text.lower().split())
+
+
+# a term starts / ends at i unless it is glued to a letter or digit, directly or with a dot ("node.js" has no "js")
+def _boundary(text, i, step):
+    j = i + step
+    if j < 0 or j >= len(text):
+        return True
+    if text[j] == ".":
+        j += step
+        return j < 0 or j >= len(text) or not text[j].isalnum()
+    return not text[j].isalnum()
+
+
+# Aho-Corasick automaton over every skill name and alias: finds all of them in one pass over the text.
+# A taxonomy entry is a list of aliases, or {"aliases": [...], "context": [...]} for names that are also
+# everyday words ("react", "swift", "rust", "unity"): the bare name then only counts with a context word nearby.
+class SkillMatcher:
+    def __init__(self, taxonomy):
+        self._goto = [{}]  # node -> {character: next node}
+        self._fail = [0]  # node -> longest proper suffix that is also in the trie
+        self._out = [[]]  # node -> [(term length, canonical skill, context pattern or None)] ending here
+        for canonical, entry in taxonomy.items():
+            if isinstance(entry, dict):
+                aliases, context = entry.get("aliases", []), entry.get("context", [])
+            else:
+                aliases, context = entry, []
+            name = normalize_term(canonical)
+            pattern = None
+            if context:
+                words = sorted(map(normalize_term, context), key=len, reverse=True)
+                pattern = re.compile(r"(?<![\w.])(?:" + "|".join(map(re.escape, words)) + r")(?![\w])")
+            for term in {name, *map(normalize_term, aliases)}:
+                if term:
+                    self._add(term, (canonical, pattern if term == name else None))
+        self._build()
+
+    def _add(self, term, value):
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._out[node].append((len(term), *value))
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    # {canonical skill: number of mentions}, in order of first mention; only whole words / phrases count
+    def find(self, text):
+        text = normalize_term(text)
+        found = {}
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, canonical, context in out[node]:
+                start = i - length + 1
+                if not (_boundary(text, start, -1) and _boundary(text, i, 1)):
+                    continue
+                if context is not None and not context.search(
+                    text, max(0, start - SKILL_CONTEXT_CHARS), i + 1 + SKILL_CONTEXT_CHARS
+                ):
+                    continue
+                found[canonical] = found.get(canonical, 0) + 1
+        return found
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+# one matcher per process, built from the taxonomy file the first time it is needed
+def get_matcher():
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                with open(SKILL_TAXONOMY, encoding="utf-8") as f:
+                    _matcher = SkillMatcher(json.load(f))
+    return _matcher
+
+
+def extract_skills(text):
+    return list(get_matcher().find(text))
+
+
+# Skills the job description asks for that the resume does not mention, most mentioned in the JD first.
+# Batch callers can pass skills they already found (resume_skills / jd_skills) to skip the text scans.
+def find_missing_skills(resume, job_desc, fuzzy=SKILL_FUZZY, resume_skills=None, jd_skills=None):
+    matcher = get_matcher()
+    if jd_skills is None:
+        jd_skills = matcher.find(job_desc)
+    if resume_skills is None:
+        resume_skills = matcher.find(resume)
+    missing = sorted((skill for skill in jd_skills if skill not in resume_skills), key=lambda skill: -jd_skills[skill])
+
+    # drop skills with a near-synonym in the resume, e.g. "Deep Learning" when the resume lists "PyTorch"
+    if fuzzy and missing and resume_skills:
+        resume_list = list(resume_skills)
+        vectors = normalize_rows(encode_texts_cached(missing + resume_list))
+        similarity = vectors[:len(missing)] @ vectors[len(missing):].T
+        missing = [skill for skill, row in zip(missing, similarity) if row.max() < SKILL_FUZZY_THRESHOLD]
+    return missing
@@ -0,0 +1,229 @@
+import os # read the telemetry settings from the environment
+import json # one JSON line per timed stage
+import time # stage timings
+import logging # rotating JSONL log
+import threading # stages are timed from many sessions and background threads
+import multiprocessing # pool worker processes neither write the log nor serve metrics
+import cProfile # built-in profiler for single requests
+import pstats # readable cProfile output
+import io # profile report in memory
+from collections import deque # recent timings per stage for the percentiles
+from contextlib import ContextDecorator # stage() works with "with" and as a decorator
+from logging.handlers import RotatingFileHandler # the log never grows past TELEMETRY_LOG_MB
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # Prometheus scrape endpoint
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import CACHE_DIR # the log and the profiles go next to the caches
+
+try:
+    import pyinstrument # optional sampling profiler, nicer output than cProfile
+except ImportError:
+    pyinstrument = None
+
+load_dotenv()
+
+# Settings, can be changed from the .env file
+TELEMETRY_LOG = os.getenv("TELEMETRY_LOG", os.path.join(CACHE_DIR, "telemetry.jsonl"))  # "" turns the log off
+TELEMETRY_LOG_MB = int(os.getenv("TELEMETRY_LOG_MB", "10"))  # size of one log file, 3 old files are kept
+TELEMETRY_PORT = int(os.getenv("TELEMETRY_PORT", "0"))  # serve Prometheus metrics on this port (0 = off)
+TELEMETRY_WINDOW = 1000  # recent timings kept per stage for the percentiles
+PROFILE_DIR = os.path.join(CACHE_DIR, "profiles")
+# started by a process pool of the server (PDF extraction, batch screening): several processes rotating the same
+# log file lose lines, and only the server process answers on TELEMETRY_PORT
+WORKER_PROCESS = multiprocessing.parent_process() is not None
+
+_lock = threading.Lock()
+_timings = {}  # stage -> deque of recent seconds
+_totals = {}  # stage -> [count, total seconds, errors] since the server started
+_counters = {}  # name -> value
+_log = None
+_server = None
+
+
+def _get_log():
+    global _log
+    if _log is None and TELEMETRY_LOG and not WORKER_PROCESS:
+        with _lock:
+            if _log is None:
+                os.makedirs(os.path.dirname(os.path.abspath(TELEMETRY_LOG)), exist_ok=True)
+                handler = RotatingFileHandler(TELEMETRY_LOG, maxBytes=TELEMETRY_LOG_MB * 1024 * 1024, backupCount=3, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                log = logging.getLogger("skillgap.telemetry")
+                log.propagate = False
+                log.setLevel(logging.INFO)
+                log.addHandler(handler)
+                _log = log
+    return _log
+
+
+# Record one finished stage; fields are extra details for the log (sizes, model, ...)
+def record(name, seconds, ok=True, **fields):
+    with _lock:
+        _timings.setdefault(name, deque(maxlen=TELEMETRY_WINDOW)).append(seconds)
+        totals = _totals.setdefault(name, [0, 0.0, 0])
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] += not ok
+    log = _get_log()
+    if log is not None:
+        log.info(json.dumps({"ts": round(time.time(), 3), "stage": name, "ms": round(seconds * 1000, 2), "ok": ok, **fields}))
+
+
+# Add to a counter, e.g. count("embedding_cache_hits", 3) or count("llm_completion_tokens", 812)
+def count(name, amount=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+# Times a stage:
+#     with stage("pdf_extract"):            or     @stage("ats_score")
+#         ...                                      def calculate(...):
+class stage(ContextDecorator):
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+
+    # a decorated function can run on several threads at once, so every call gets its own timer
+    def _recreate_cm(self):
+        return stage(self.name, **self.fields)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self._start, ok=exc_type is None, **self.fields)
+        return False
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+# {stage: {"count", "errors", "mean_ms", "p50_ms", "p95_ms", "p99_ms"}} over the recent timings
+def stage_stats():
+    with _lock:
+        snapshot = {name: (sorted(values), list(_totals[name])) for name, values in _timings.items()}
+    stats = {}
+    for name, (values, (total_count, total_seconds, errors)) in sorted(snapshot.items()):
+        stats[name] = {
+            "count": total_count,
+            "errors": errors,
+            "mean_ms": total_seconds / total_count * 1000,
+            "p50_ms": _percentile(values, 0.50) * 1000,
+            "p95_ms": _percentile(values, 0.95) * 1000,
+            "p99_ms": _percentile(values, 0.99) * 1000,
+        }
+    return stats
+
+
+def counters():
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+
+# Everything above in the Prometheus text format
+def prometheus_text():
+    lines = ["# TYPE skillgap_stage_seconds summary"]
+    with _lock:
+        snapshot = {name: (sorted(values), list(_totals[name])) for name, values in _timings.items()}
+        counter_items = sorted(_counters.items())
+    for name, (values, (total_count, total_seconds, errors)) in sorted(snapshot.items()):
+        for quantile in (0.5, 0.95, 0.99):
+            lines.append(f'skillgap_stage_seconds{{stage="{name}",quantile="{quantile}"}} {_percentile(values, quantile):.6f}')
+        lines.append(f'skillgap_stage_seconds_sum{{stage="{name}"}} {total_seconds:.6f}')
+        lines.append(f'skillgap_stage_seconds_count{{stage="{name}"}} {total_count}')
+    lines.append("# TYPE skillgap_stage_errors_total counter")
+    for name, (values, (total_count, total_seconds, errors)) in sorted(snapshot.items()):
+        lines.append(f'skillgap_stage_errors_total{{stage="{name}"}} {errors}')
+    for name, value in counter_items:
+        lines.append(f"# TYPE skillgap_{name}_total counter")
+        lines.append(f"skillgap_{name}_total {value}")
+    return "\n".join(lines) + "\n"
+
+
+# /metrics for Prometheus, /ready answers 200 once the model is warm (503 while warming or after a failed warm-up)
+# for load balancers; with MODEL_WARMUP=0 ("idle") the model loads on first use, so it answers 200
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/ready"):
+            from utils.warmup import warmup_state # imported here, warmup itself uses this module
+            state = warmup_state()
+            body = json.dumps(state).encode("utf-8")
+            self.send_response(503 if state["status"] in ("warming", "failed") else 200)
+            self.send_header("Content-Type", "application/json")
+        else:
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # no line on stderr for every scrape
+
+
+# Serve /metrics for Prometheus on TELEMETRY_PORT, once per server process (does nothing when the port is 0
+# or in a pool worker process)
+def start_metrics_server(port=TELEMETRY_PORT):
+    global _server
+    if not port or _server is not None or WORKER_PROCESS:
+        return
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            except OSError:  # another process (e.g. a second Streamlit worker) already serves this port
+                return
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+
+
+# Profile one request: "with profiled(enabled, name) as profile:" or profile.start() ... profile.stop()
+# afterwards profile.path is the saved report (pyinstrument HTML if installed, otherwise cProfile text)
+class profiled:
+    def __init__(self, enabled, name):
+        self.enabled = enabled
+        self.name = name
+        self.path = None
+        self._profiler = None
+
+    def start(self):
+        if self.enabled and self._profiler is None:
+            if pyinstrument is not None:
+                self._profiler = pyinstrument.Profiler()
+                self._profiler.start()
+            else:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+        return self
+
+    # stop profiling and save the report (only the first call does anything)
+    def stop(self):
+        if self._profiler is None or self.path is not None:
+            return self.path
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if isinstance(self._profiler, cProfile.Profile):
+            self._profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(self._profiler, stream=output).sort_stats("cumulative").print_stats(60)
+            self.path = os.path.join(PROFILE_DIR, f"{self.name}-{stamp}.txt")
+            report = output.getvalue()
+        else:
+            self._profiler.stop()
+            self.path = os.path.join(PROFILE_DIR, f"{self.name}-{stamp}.html")
+            report = self._profiler.output_html()
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(report)
+        return self.path
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+# the Prometheus endpoint starts with the first page that records anything
+start_metrics_server()
@@ -0,0 +1,50 @@
+import os # read the warm-up setting from the environment
+import threading # the model is loaded on a background thread
+import time # warm-up duration
+from dotenv import load_dotenv # extract settings from .env file
+from utils.embeddings import encode_texts # loads the model and its tokenizer on first use
+from utils.telemetry import stage # warm-up timing
+
+load_dotenv()
+
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1") == "1"  # load the model in the background when the first page opens
+
+_lock = threading.Lock()
+_state = {"status": "idle", "seconds": None, "error": None}  # idle -> warming -> ready / failed
+
+
+def _warm_up():
+    start = time.perf_counter()
+    try:
+        with stage("warmup"):
+            # one tiny encode loads the model and the tokenizer and runs the first (slowest) inference
+            encode_texts(["warm up"])
+            # the libraries of the next stages, so the first report / export does not pay for their import
+            for module in ("pdfminer.high_level", "groq", "fpdf"):
+                try:
+                    __import__(module)
+                except ImportError:
+                    pass
+        _state.update(status="ready", seconds=time.perf_counter() - start)
+    except Exception as e:
+        _state.update(status="failed", seconds=time.perf_counter() - start, error=str(e))
+
+
+# Start the warm-up once per server process; every page can call this, only the first call does anything
+def start_warmup():
+    if not MODEL_WARMUP or _state["status"] != "idle":
+        return
+    with _lock:
+        if _state["status"] != "idle":
+            return
+        _state["status"] = "warming"
+    threading.Thread(target=_warm_up, name="model-warmup", daemon=True).start()
+
+
+# {"status": "idle" | "warming" | "ready" | "failed", "seconds", "error"}
+def warmup_state():
+    return dict(_state)
+
+
+def is_ready():
+    return _state["status"] == "ready"
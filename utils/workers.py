@@ -0,0 +1,15 @@
+import os # read the pool size from the environment
+from concurrent.futures import ThreadPoolExecutor # run CPU work while the page waits on the network
+from dotenv import load_dotenv # extract settings from .env file
+
+load_dotenv()
+
+# Threads shared by all sessions for background work like embedding (torch releases the GIL while it computes)
+BACKGROUND_WORKERS = int(os.getenv("BACKGROUND_WORKERS", "4"))
+
+_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="skillgap-worker")
+
+
+# Start fn(*args) in the background and get a Future back, use future.done() / future.result() to read it
+def run_in_background(fn, *args, **kwargs):
+    return _executor.submit(fn, *args, **kwargs)
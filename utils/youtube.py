@@ -0,0 +1,148 @@
+import os # read the API key and settings from the environment
+import json # cached results are stored as JSON
+import sqlite3 # the daily quota is counted in its own table, shared by all server processes
+import threading # one client per process, one HTTP connection per thread
+import time # cache age
+from concurrent.futures import ThreadPoolExecutor # search several skills at the same time
+from datetime import datetime # the daily quota resets at midnight Pacific time
+from dotenv import load_dotenv # extract settings from .env file
+from utils.cache import CACHE_DIR, SQLiteStore # results survive server restarts and are shared by all processes
+from utils.telemetry import stage, count # search timings, cache hits and API calls
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except Exception:  # no timezone data (e.g. Windows without tzdata), fall back to UTC
+    QUOTA_TIMEZONE = None
+
+load_dotenv()
+YOUTUBE_KEY = os.getenv("YOUTUBE_API_KEY")
+
+# Settings, can be changed from the .env file
+YOUTUBE_CACHE_TTL = int(os.getenv("YOUTUBE_CACHE_TTL", str(7 * 24 * 3600)))  # seconds before a result is refreshed
+YOUTUBE_WORKERS = int(os.getenv("YOUTUBE_WORKERS", "5"))  # searches running at the same time
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))  # units per day of the API project
+YOUTUBE_QUOTA_RESERVE = float(os.getenv("YOUTUBE_QUOTA_RESERVE", "0.05"))  # part of the quota kept unused
+SEARCH_COST = 100 # quota units of one search().list call
+
+_client = None
+_client_lock = threading.Lock()
+_thread_local = threading.local()
+_store = None
+
+
+# one discovery client per server process
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from googleapiclient.discovery import build # used for youtube API, imported on the first search
+                _client = build("youtube", "v3", developerKey=YOUTUBE_KEY, cache_discovery=False)
+    return _client
+
+
+def _thread_http():
+    if not hasattr(_thread_local, "http"):
+        import httplib2 # HTTP connections used by the Google API client (not thread safe, so one per thread)
+        _thread_local.http = httplib2.Http(timeout=15)
+    return _thread_local.http
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        with _client_lock:
+            if _store is None:
+                _store = SQLiteStore("youtube", 64 * 1024 * 1024)
+    return _store
+
+
+# "Docker", "docker " and "DOCKER" share one cache entry
+def normalize_skill(skill):
+    return " ".join(skill.lower().split())
+
+
+def _quota_day():
+    return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+# The quota lives in its own table, not in the result cache, so cache eviction can never reset it.
+# A new connection per call: quota is only taken on cache misses, and every server process can use it.
+def _quota_connection():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    connection = sqlite3.connect(os.path.join(CACHE_DIR, "youtube_quota.sqlite3"), timeout=30, isolation_level=None)
+    connection.execute("CREATE TABLE IF NOT EXISTS quota (day TEXT PRIMARY KEY, used INTEGER NOT NULL)")
+    return connection
+
+
+def quota_used():
+    connection = _quota_connection()
+    try:
+        row = connection.execute("SELECT used FROM quota WHERE day = ?", (_quota_day(),)).fetchone()
+        return row[0] if row else 0
+    finally:
+        connection.close()
+
+
+# reserve the units for one search, returns False when the daily quota is (nearly) used up.
+# The check and the increment are one UPDATE inside a write transaction, so processes cannot race on it.
+def _take_quota(cost=SEARCH_COST):
+    limit = YOUTUBE_DAILY_QUOTA * (1 - YOUTUBE_QUOTA_RESERVE)
+    day = _quota_day()
+    connection = _quota_connection()
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute("INSERT OR IGNORE INTO quota (day, used) VALUES (?, 0)", (day,))
+        taken = connection.execute(
+            "UPDATE quota SET used = used + ? WHERE day = ? AND used + ? <= ?", (cost, day, cost, limit)
+        ).rowcount == 1
+        connection.execute("COMMIT")
+        return taken
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+
+
+# Search YouTube for courses on one skill.
+# Returns (videos, status): status is "cached", "fresh", "stale" (old result served to save quota) or an error message
+def search_youtube_courses(skill, max_results=5):
+    store = _get_store()
+    key = f"search:{normalize_skill(skill)}:{max_results}"
+    row = store.get(key)
+    if row is not None and time.time() - row[1] <= YOUTUBE_CACHE_TTL:
+        count("youtube_cache_hits")
+        return json.loads(row[0]), "cached"
+    count("youtube_cache_misses")
+
+    if not _take_quota():
+        if row is not None:
+            return json.loads(row[0]), "stale"
+        return [], "YouTube daily quota nearly used up, try again tomorrow"
+
+    try:
+        count("youtube_api_calls")
+        with stage("youtube_search"):
+            request = get_client().search().list(
+                q=f"{normalize_skill(skill)} full course tutorial",
+                part="snippet",
+                type="video",
+                maxResults=max_results
+            )
+            videos = request.execute(http=_thread_http()).get("items", [])
+    except Exception as e:
+        if row is not None:
+            return json.loads(row[0]), "stale"
+        return [], f"YouTube API Error: {e}"
+
+    store.set(key, json.dumps(videos).encode("utf-8"))
+    return videos, "fresh"
+
+
+# Search all skills at the same time, returns {skill: (videos, status)} in the same order as skills
+def search_courses_for_skills(skills, max_results=5):
+    with ThreadPoolExecutor(max_workers=YOUTUBE_WORKERS) as pool:
+        results = pool.map(lambda skill: search_youtube_courses(skill, max_results), skills)
+        return dict(zip(skills, results))